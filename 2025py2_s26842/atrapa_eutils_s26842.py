@@ -0,0 +1,146 @@
+# Lokalny serwer zastępczy (atrapa) NCBI E-utilities dla modułu eutils_s26842.py.
+
+# Cel modułu:
+# Naśladuje odpowiedzi esearch (z historią WebEnv/QueryKey), esummary oraz efetch (rekordy GenBank
+# i taksonomia w XML) dla sztucznego wyszukiwania o zadanej liczbie wyników, tak aby stronicowanie,
+# ponawianie po błędach, kolejność partii, wznawianie pobierania i pamięć podręczną można było
+# sprawdzić bez dostępu do sieci. Serwer zapisuje wszystkie otrzymane zapytania i na żądanie
+# zwraca błędy HTTP (np. 503) dla wybranych zapytań.
+
+# Przykład (skrypt s26842_2025.py działający na atrapie):
+#   python atrapa_eutils_s26842.py --port 8080 --liczba 2345
+#   EUTILS_URL=http://127.0.0.1:8080 python s26842_2025.py
+
+import argparse  # Obsługa argumentów linii poleceń
+import threading  # Wątek serwera i blokada stanu
+import urllib.parse  # Dekodowanie parametrów zapytań
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer  # Serwer HTTP obsługujący wiele połączeń
+
+_ESEARCH = ('<?xml version="1.0" encoding="UTF-8" ?>\n<!DOCTYPE eSearchResult PUBLIC "-//NLM//DTD esearch 20060628//EN" '
+            '"https://eutils.ncbi.nlm.nih.gov/eutils/dtd/20060628/esearch.dtd">\n<eSearchResult><Count>{liczba}</Count>'
+            '<RetMax>0</RetMax><RetStart>0</RetStart><QueryKey>1</QueryKey><WebEnv>{webenv}</WebEnv><IdList></IdList>'
+            '<TranslationSet/><QueryTranslation>{term}</QueryTranslation></eSearchResult>\n')
+_ESUMMARY = ('<?xml version="1.0" encoding="UTF-8" ?>\n<!DOCTYPE eSummaryResult PUBLIC "-//NLM//DTD eSummaryResult, '
+             '29 October 2004//EN" "https://eutils.ncbi.nlm.nih.gov/eutils/dtd/20041029/esummary-v1.dtd">\n'
+             '<eSummaryResult>{dokumenty}</eSummaryResult>\n')
+_DOCSUM = ('<DocSum><Id>{numer}</Id><Item Name="Title" Type="String">Sekwencja atrapy {numer}</Item>'
+           '<Item Name="AccessionVersion" Type="String">MOCK{numer:06d}.1</Item>'
+           '<Item Name="Length" Type="Integer">{dlugosc}</Item></DocSum>')
+_TAKSON = ('<?xml version="1.0" ?>\n<!DOCTYPE TaxaSet PUBLIC "-//NLM//DTD Taxon, 14th January 2002//EN" '
+           '"https://www.ncbi.nlm.nih.gov/entrez/query/DTD/taxon.dtd">\n<TaxaSet><Taxon><TaxId>{id}</TaxId>'
+           '<ScientificName>Organizm atrapy {id}</ScientificName></Taxon></TaxaSet>\n')
+
+
+def dlugosc_rekordu(numer: int) -> int:
+    """Długość sekwencji rekordu o danym numerze (powtarzalna, różna dla kolejnych rekordów)."""
+    return 100 + numer * 7919 % 5000
+
+
+def rekord_genbank(numer: int) -> str:
+    """Minimalny rekord GenBank (zakończony linią '//') dla rekordu o danym numerze."""
+    return (f"LOCUS       MOCK{numer:06d}  {dlugosc_rekordu(numer)} bp    DNA     linear   SYN\n"
+            f"ACCESSION   MOCK{numer:06d}\nVERSION     MOCK{numer:06d}.1\nORIGIN\n        1 acgt\n//\n")
+
+
+class AtrapaEutils:
+    """Serwer E-utilities działający w tle na 127.0.0.1 (port 0 - wolny port wybrany przez system).
+
+    liczba - liczba wyników każdego wyszukiwania (można ją zmieniać między zapytaniami);
+    zapytania - lista (narzędzie, parametry) wszystkich otrzymanych zapytań;
+    bledy - lista (narzędzie, retstart lub None, kod HTTP) błędów zwracanych kolejnym pasującym zapytaniom.
+    """
+
+    def __init__(self, liczba: int = 0, port: int = 0):
+        self.liczba = liczba
+        self.zapytania = []
+        self.bledy = []
+        self._sesje = 0  # Liczba wykonanych esearch - każde tworzy nowy WebEnv
+        self._blokada = threading.Lock()
+        atrapa = self
+
+        class Obsluga(BaseHTTPRequestHandler):
+            def do_POST(self):
+                dlugosc = int(self.headers.get("Content-Length", 0))
+                parametry = dict(urllib.parse.parse_qsl(self.rfile.read(dlugosc).decode("utf-8")))
+                kod, tresc = atrapa._odpowiedz(self.path.rsplit("/", 1)[-1], parametry)
+                self.send_response(kod)
+                self.send_header("Content-Type", "text/xml" if tresc.startswith(b"<?xml") else "text/plain")
+                self.send_header("Content-Length", str(len(tresc)))
+                self.end_headers()
+                self.wfile.write(tresc)
+
+            def log_message(self, *argumenty):  # Bez wpisów w konsoli dla każdego zapytania
+                pass
+
+        self._serwer = ThreadingHTTPServer(("127.0.0.1", port), Obsluga)
+        self._watek = None
+
+    @property
+    def url(self) -> str:
+        """Adres bazowy do użycia jako url= lub EUTILS_URL."""
+        return f"http://127.0.0.1:{self._serwer.server_address[1]}"
+
+    def liczba_zapytan(self, cgi: str) -> int:
+        """Zwraca liczbę otrzymanych zapytań do danego narzędzia (np. 'esummary.fcgi')."""
+        with self._blokada:
+            return sum(1 for narzedzie, _ in self.zapytania if narzedzie == cgi)
+
+    def _odpowiedz(self, cgi: str, parametry: dict) -> tuple:
+        """Zwraca (kod HTTP, treść) odpowiedzi na zapytanie."""
+        with self._blokada:
+            self.zapytania.append((cgi, parametry))
+            start = int(parametry.get("retstart", 0))
+            for blad in self.bledy:
+                if blad[0] == cgi and blad[1] in (None, start):
+                    self.bledy.remove(blad)
+                    return blad[2], b"Blad atrapy"
+            if cgi == "esearch.fcgi":
+                self._sesje += 1
+                return 200, _ESEARCH.format(liczba=self.liczba, webenv=f"MOCK_{self._sesje}",
+                                            term=parametry.get("term", "")).encode("utf-8")
+            liczba = self.liczba
+        koniec = min(liczba, start + int(parametry.get("retmax", 20)))
+        if cgi == "esummary.fcgi":
+            dokumenty = "".join(_DOCSUM.format(numer=numer, dlugosc=dlugosc_rekordu(numer)) for numer in range(start, koniec))
+            return 200, _ESUMMARY.format(dokumenty=dokumenty).encode("utf-8")
+        if cgi == "efetch.fcgi" and parametry.get("db") == "taxonomy":
+            return 200, _TAKSON.format(id=parametry.get("id", "0")).encode("utf-8")
+        if cgi == "efetch.fcgi":
+            return 200, "".join(rekord_genbank(numer) for numer in range(start, koniec)).encode("ascii")
+        return 404, b"Nieznane narzedzie"
+
+    def uruchom(self) -> "AtrapaEutils":
+        """Uruchamia serwer w wątku w tle i zwraca self."""
+        self._watek = threading.Thread(target=self._serwer.serve_forever, daemon=True)
+        self._watek.start()
+        return self
+
+    def zatrzymaj(self):
+        """Zatrzymuje serwer i zwalnia port."""
+        self._serwer.shutdown()
+        self._serwer.server_close()
+
+    def __enter__(self):
+        return self.uruchom()
+
+    def __exit__(self, *wyjatek):
+        self.zatrzymaj()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Lokalna atrapa NCBI E-utilities (esearch, esummary, efetch).")
+    parser.add_argument('--port', type=int, default=8080, help="Port serwera (domyślnie 8080).")
+    parser.add_argument('--liczba', type=int, default=2345, help="Liczba wyników każdego wyszukiwania.")
+    argumenty = parser.parse_args()
+    atrapa = AtrapaEutils(argumenty.liczba, argumenty.port)
+    print(f"Atrapa E-utilities: {atrapa.url} (EUTILS_URL={atrapa.url})")
+    try:
+        atrapa._serwer.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        atrapa._serwer.server_close()
+
+
+if __name__ == "__main__":
+    main()
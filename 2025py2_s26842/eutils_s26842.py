@@ -0,0 +1,591 @@
+# Pomocnicze funkcje dostępu do NCBI E-utilities dla skryptu s26842_2025.py.
+
+# Cel modułu:
+# Stronicowane, współbieżne pobieranie wyników (esummary) przez historię WebEnv/QueryKey,
+# z ogranicznikiem zapytań typu token bucket zgodnym z limitami NCBI (3 zapytania/s,
+# 10 zapytań/s z kluczem Entrez.api_key) oraz ponawianiem nieudanych partii z rosnącym opóźnieniem.
+# Adres E-utilities można zmienić (parametr url lub zmienna środowiskowa EUTILS_URL),
+# np. na lokalny serwer zastępczy naśladujący odpowiedzi NCBI (atrapa_eutils_s26842.py, używana w testach).
+# Odpowiedzi mogą być zapisywane w trwałej pamięci podręcznej na dysku (PamiecPodreczna), dzięki czemu
+# powtórne uruchomienia dla tych samych taksonów nie wykonują żadnych zapytań sieciowych.
+# Duże pobrania rekordów GenBank są zapisywane strumieniowo, partiami, z punktem kontrolnym po każdej
+# partii (pobierz_genbank), więc przerwane pobieranie można wznowić od miejsca przerwania.
+# Podsumowania są dopisywane do pliku CSV partia po partii (ZapisPodsumowan), który na bieżąco zbiera
+# najdłuższe sekwencje i statystyki długości - pamięć nie rośnie z liczbą wyników.
+
+import csv  # Zapis tabeli podsumowań
+import gzip  # Kompresja plików GenBank pobieranych strumieniowo
+import hashlib  # Skrót znormalizowanego zapytania - nazwa pliku w pamięci podręcznej
+import heapq  # Ograniczony kopiec najdłuższych sekwencji
+import http.client  # Błędy protokołu HTTP (np. przerwana odpowiedź)
+import io  # Opakowanie pobranych bajtów w obiekt plikopodobny dla Entrez.read
+import json  # Zapis znormalizowanego zapytania przed wyliczeniem skrótu
+import os  # Odczyt zmiennych środowiskowych i operacje na plikach pamięci podręcznej
+import struct  # Nagłówek wpisu pamięci podręcznej (czas zapisu)
+import tempfile  # Pliki tymczasowe - atomowy zapis wpisów pamięci podręcznej
+import threading  # Blokada ogranicznika zapytań współdzielonego przez wątki
+import time  # Pomiar czasu i opóźnienia
+import urllib.error  # Błędy HTTP i sieci
+import urllib.parse  # Kodowanie parametrów zapytań
+import urllib.request  # Wykonywanie zapytań HTTP
+from collections import deque  # Kolejka partii w toku (zachowanie kolejności wyników)
+from concurrent.futures import ThreadPoolExecutor  # Współbieżne pobieranie partii
+
+from Bio import Entrez  # Parser odpowiedzi XML E-utilities i ustawienia email/api_key/tool
+
+URL_EUTILS = os.environ.get("EUTILS_URL", "https://eutils.ncbi.nlm.nih.gov/entrez/eutils")  # Adres bazowy
+KODY_DO_PONOWIENIA = {429, 500, 502, 503, 504}  # Odpowiedzi HTTP, po których warto ponowić zapytanie
+LIMIT_BEZ_KLUCZA = 3  # Zapytań na sekundę bez klucza API (limit NCBI)
+LIMIT_Z_KLUCZEM = 10  # Zapytań na sekundę z kluczem API (limit NCBI)
+DOMYSLNY_KATALOG_PAMIECI = os.path.join(os.path.expanduser("~"), ".cache", "eutils_s26842")  # Pamięć podręczna
+DOMYSLNY_TTL = 7 * 24 * 3600  # Czas ważności wpisu pamięci podręcznej w sekundach (tydzień)
+DOMYSLNY_MAKS_MB = 1024  # Maksymalny rozmiar pamięci podręcznej w MiB
+CEL_PRZYCIECIA = 0.9  # Po przekroczeniu limitu pamięć przycinana jest do tej części maks_bajtow
+POMIJANE_W_KLUCZU = {"tool", "email", "api_key"}  # Parametry nie wpływające na treść odpowiedzi
+_NAGLOWEK_WPISU = b"EUC1"  # Znacznik początku pliku wpisu pamięci podręcznej
+ROZMIAR_BUFORA_STRUMIENIA = 1 << 20  # Porcja odpowiedzi kopiowana naraz na dysk (ograniczona pamięć)
+POZIOM_KOMPRESJI = 6  # Poziom gzip plików GenBank (9 jest kilkukrotnie wolniejszy przy niewiele mniejszym pliku)
+
+
+class LimiterZetonow:
+    """Ogranicznik liczby zapytań typu token bucket, bezpieczny przy użyciu z wielu wątków.
+
+    Żetony przybywają w tempie na_sekunde, a wiadro mieści ich najwyżej pojemnosc; domyślna
+    pojemność 1 oznacza równe odstępy między zapytaniami, bez serii przekraczających limit.
+    """
+
+    def __init__(self, na_sekunde: float, pojemnosc: float = 1):
+        if na_sekunde <= 0 or pojemnosc < 1:
+            raise ValueError("Tempo musi być dodatnie, a pojemność wynosić co najmniej 1.")
+        self.na_sekunde = na_sekunde
+        self.pojemnosc = pojemnosc
+        self._zetony = pojemnosc  # Pełne wiadro na starcie
+        self._ostatnio = time.monotonic()  # Chwila ostatniego uzupełnienia żetonów
+        self._blokada = threading.Lock()
+
+    def pobierz(self):
+        """Czeka, aż dostępny będzie żeton, i zużywa go."""
+        while True:
+            with self._blokada:
+                teraz = time.monotonic()
+                self._zetony = min(self.pojemnosc, self._zetony + (teraz - self._ostatnio) * self.na_sekunde)
+                self._ostatnio = teraz
+                if self._zetony >= 1:
+                    self._zetony -= 1
+                    return
+                czekaj = (1 - self._zetony) / self.na_sekunde  # Czas do pojawienia się pełnego żetonu
+            time.sleep(czekaj)  # Oczekiwanie poza blokadą - inne wątki mogą sprawdzać stan wiadra
+
+
+_limitery = {}  # Wspólne ograniczniki dla danego tempa - wszystkie zapytania procesu dzielą jeden limit
+_blokada_limiterow = threading.Lock()
+
+
+def limiter_ncbi() -> LimiterZetonow:
+    """Zwraca wspólny ogranicznik zgodny z limitem NCBI dla bieżącego ustawienia Entrez.api_key."""
+    na_sekunde = LIMIT_Z_KLUCZEM if Entrez.api_key else LIMIT_BEZ_KLUCZA
+    with _blokada_limiterow:
+        if na_sekunde not in _limitery:
+            _limitery[na_sekunde] = LimiterZetonow(na_sekunde)
+        return _limitery[na_sekunde]
+
+
+class BrakWPamieciPodrecznej(LookupError):
+    """Zgłaszany w trybie offline, gdy odpowiedzi nie ma w pamięci podręcznej."""
+
+
+def klucz_zapytania(cgi: str, parametry: dict) -> str:
+    """Zwraca skrót znormalizowanego zapytania (narzędzie, db, term, id, rettype, okno stronicowania...)."""
+    znormalizowane = {}
+    for klucz, wartosc in parametry.items():
+        klucz = klucz.lower()
+        if klucz in POMIJANE_W_KLUCZU or wartosc is None:
+            continue
+        if isinstance(wartosc, (list, tuple)):  # Lista identyfikatorów jak w Bio.Entrez
+            wartosc = ",".join(str(element) for element in wartosc)
+        wartosc = str(wartosc).strip()
+        if klucz == "term":  # Nadmiarowe odstępy nie zmieniają wyniku wyszukiwania
+            wartosc = " ".join(wartosc.split())
+        elif klucz == "id":
+            wartosc = ",".join(element.strip() for element in wartosc.split(","))
+        znormalizowane[klucz] = wartosc
+    tekst = json.dumps([cgi, sorted(znormalizowane.items())], ensure_ascii=False)
+    return hashlib.sha256(tekst.encode("utf-8")).hexdigest()
+
+
+class PamiecPodreczna:
+    """Trwała pamięć podręczna odpowiedzi E-utilities w katalogu na dysku.
+
+    Każdy wpis to osobny plik zapisywany atomowo (plik tymczasowy + os.replace), więc z jednego katalogu
+    może korzystać wiele procesów naraz. Wpisy starsze niż ttl sekund są pomijane (poza trybem offline),
+    a po przekroczeniu maks_bajtow usuwane są najdawniej używane wpisy (LRU według czasu modyfikacji).
+    Łączny rozmiar jest śledzony na bieżąco, a katalog przeglądany jest tylko wtedy, gdy limit mógł zostać
+    przekroczony lub od ostatniego przeglądu zapisano maks_bajtow/10 (zapisy innych procesów).
+    """
+
+    def __init__(self, katalog: str, ttl: float = DOMYSLNY_TTL, maks_bajtow: int = DOMYSLNY_MAKS_MB << 20,
+                 offline: bool = False):
+        self.katalog = katalog
+        self.ttl = ttl  # None - wpisy nie wygasają
+        self.maks_bajtow = maks_bajtow
+        self.offline = offline  # Tylko odpowiedzi z pamięci podręcznej, bez sieci
+        self._rozmiar = None  # Szacowany łączny rozmiar wpisów (None - nieznany, potrzebny przegląd katalogu)
+        self._zapisano_od_przegladu = 0  # Bajty zapisane przez ten obiekt od ostatniego przeglądu
+        self._blokada_rozmiaru = threading.Lock()  # Zapisy z wielu wątków pobierających partie
+        os.makedirs(katalog, exist_ok=True)
+
+    def _sciezka(self, cgi: str, parametry: dict) -> str:
+        skrot = klucz_zapytania(cgi, parametry)
+        return os.path.join(self.katalog, skrot[:2], f"{skrot}.wpis")  # Podkatalogi - mniej plików w jednym
+
+    def pobierz(self, cgi: str, parametry: dict):
+        """Zwraca zapisaną odpowiedź (bajty) lub None, gdy jej brak albo wygasła."""
+        sciezka = self._sciezka(cgi, parametry)
+        try:
+            with open(sciezka, 'rb') as plik:
+                naglowek = plik.read(12)
+                tresc = plik.read()
+        except FileNotFoundError:  # Brak wpisu lub usunięty przez inny proces
+            return None
+        if len(naglowek) < 12 or naglowek[:4] != _NAGLOWEK_WPISU:  # Uszkodzony wpis traktowany jak brak
+            return None
+        czas_zapisu = struct.unpack("<d", naglowek[4:])[0]
+        if not self.offline and self.ttl is not None and time.time() - czas_zapisu > self.ttl:
+            return None
+        try:
+            os.utime(sciezka)  # Oznaczenie ostatniego użycia dla LRU
+        except OSError:
+            pass
+        return tresc
+
+    def zawiera(self, cgi: str, parametry: dict) -> bool:
+        """Sprawdza (czytając tylko nagłówek), czy pamięć zawiera ważną odpowiedź na zapytanie."""
+        try:
+            with open(self._sciezka(cgi, parametry), 'rb') as plik:
+                naglowek = plik.read(12)
+        except FileNotFoundError:
+            return False
+        if len(naglowek) < 12 or naglowek[:4] != _NAGLOWEK_WPISU:
+            return False
+        czas_zapisu = struct.unpack("<d", naglowek[4:])[0]
+        return self.offline or self.ttl is None or time.time() - czas_zapisu <= self.ttl
+
+    def zapisz(self, cgi: str, parametry: dict, tresc: bytes):
+        """Zapisuje odpowiedź atomowo i w razie potrzeby usuwa najdawniej używane wpisy."""
+        sciezka = self._sciezka(cgi, parametry)
+        os.makedirs(os.path.dirname(sciezka), exist_ok=True)
+        try:
+            poprzedni_rozmiar = os.stat(sciezka).st_size  # Nadpisywany wpis
+        except FileNotFoundError:
+            poprzedni_rozmiar = 0
+        deskryptor, tymczasowy = tempfile.mkstemp(dir=os.path.dirname(sciezka), prefix=".tmp_")
+        try:
+            with os.fdopen(deskryptor, 'wb') as plik:
+                plik.write(_NAGLOWEK_WPISU + struct.pack("<d", time.time()) + tresc)
+            os.replace(tymczasowy, sciezka)  # Inne procesy widzą stary albo nowy wpis, nigdy połowiczny
+        except BaseException:
+            try:
+                os.remove(tymczasowy)
+            except OSError:
+                pass
+            raise
+        rozmiar = len(_NAGLOWEK_WPISU) + 8 + len(tresc)
+        with self._blokada_rozmiaru:
+            if self._rozmiar is not None:
+                self._rozmiar += rozmiar - poprzedni_rozmiar
+            self._zapisano_od_przegladu += rozmiar
+            if (self._rozmiar is None or self._rozmiar > self.maks_bajtow
+                    or self._zapisano_od_przegladu > self.maks_bajtow // 10):
+                self._przytnij()
+
+    def _przytnij(self):
+        """Przegląda katalog i po przekroczeniu maks_bajtow usuwa najdawniej używane wpisy,
+        aż łączny rozmiar spadnie do CEL_PRZYCIECIA * maks_bajtow (zapas - kolejne zapisy nie wymagają przeglądu)."""
+        wpisy = []
+        suma = 0
+        for podkatalog in os.scandir(self.katalog):
+            if not podkatalog.is_dir():
+                continue
+            for wpis in os.scandir(podkatalog.path):
+                if not wpis.name.endswith(".wpis"):
+                    continue
+                try:
+                    informacje = wpis.stat()
+                except FileNotFoundError:  # Usunięty w międzyczasie przez inny proces
+                    continue
+                wpisy.append((informacje.st_mtime, informacje.st_size, wpis.path))
+                suma += informacje.st_size
+        if suma > self.maks_bajtow:
+            cel = int(self.maks_bajtow * CEL_PRZYCIECIA)
+            for _, rozmiar, sciezka in sorted(wpisy):
+                try:
+                    os.remove(sciezka)
+                except FileNotFoundError:
+                    pass
+                suma -= rozmiar
+                if suma <= cel:
+                    break
+        self._rozmiar = suma
+        self._zapisano_od_przegladu = 0
+
+
+def pamiec_ze_srodowiska():
+    """Tworzy pamięć podręczną wg zmiennych środowiskowych: EUTILS_CACHE (katalog, pusty - wyłączona),
+    EUTILS_CACHE_TTL (sekundy), EUTILS_CACHE_MB (MiB) i EUTILS_OFFLINE (1 - tylko pamięć podręczna)."""
+    katalog = os.environ.get("EUTILS_CACHE", DOMYSLNY_KATALOG_PAMIECI)
+    if not katalog:
+        return None
+    return PamiecPodreczna(katalog, float(os.environ.get("EUTILS_CACHE_TTL", DOMYSLNY_TTL)),
+                           int(float(os.environ.get("EUTILS_CACHE_MB", DOMYSLNY_MAKS_MB)) * 2 ** 20),
+                           os.environ.get("EUTILS_OFFLINE", "") not in ("", "0"))
+
+
+def _parametry(parametry: dict) -> dict:
+    """Uzupełnia parametry zapytania o tool, email i api_key ustawione w module Entrez."""
+    wynik = {klucz: wartosc for klucz, wartosc in parametry.items() if wartosc is not None}
+    for klucz, wartosc in (("tool", Entrez.tool), ("email", Entrez.email), ("api_key", Entrez.api_key)):
+        if wartosc and klucz not in wynik:
+            wynik[klucz] = wartosc
+    return wynik
+
+
+def zapytanie(cgi: str, parametry, limiter: LimiterZetonow = None, url: str = None, proby: int = 5,
+              opoznienie: float = 1.0, parsuj: bool = False, pamiec: PamiecPodreczna = None, klucz: dict = None,
+              pomin_odczyt: bool = False):
+    """Wysyła zapytanie POST do E-utilities (np. cgi='esummary.fcgi') i zwraca bajty odpowiedzi
+    (lub wynik Entrez.read, gdy parsuj=True).
+
+    Błędy sieci, odpowiedzi 429/5xx oraz niepoprawne XML są ponawiane do proby razy,
+    z opóźnieniem rosnącym dwukrotnie po każdej próbie. Z pamięcią podręczną odpowiedź jest najpierw
+    szukana pod kluczem klucz (domyślnie parametry), a poprawna odpowiedź z sieci jest w niej zapisywana.
+    parametry mogą być funkcją zwracającą słownik - wywoływaną dopiero wtedy, gdy potrzebna jest sieć;
+    klucz może być funkcją - wywoływaną ponownie po parametrach, aby zapis trafił pod klucz aktualnego stanu.
+    """
+    klucz_zapisu = klucz
+    if pamiec is not None:
+        klucz = klucz() if callable(klucz) else klucz if klucz is not None else parametry
+        if not pomin_odczyt:
+            tresc = pamiec.pobierz(cgi, klucz)
+            if tresc is not None:
+                try:
+                    return Entrez.read(io.BytesIO(tresc)) if parsuj else tresc
+                except (ValueError, RuntimeError):  # Uszkodzony wpis - pobranie od nowa
+                    pass
+        if pamiec.offline:
+            raise BrakWPamieciPodrecznej(f"Brak odpowiedzi {cgi} w pamięci podręcznej (tryb offline).")
+    if callable(parametry):  # Parametry zależne od stanu (np. odświeżony WebEnv)
+        parametry = parametry()
+    if callable(klucz_zapisu):  # Klucz po ewentualnym odświeżeniu stanu
+        klucz = klucz_zapisu()
+    zadanie = _zadanie_http(cgi, parametry, url)
+
+    def operacja():
+        with urllib.request.urlopen(zadanie, timeout=120) as odpowiedz:
+            tresc = odpowiedz.read()
+        wynik = Entrez.read(io.BytesIO(tresc)) if parsuj else tresc
+        if pamiec is not None:  # Zapisywane są tylko odpowiedzi, które dało się odczytać
+            pamiec.zapisz(cgi, klucz, tresc)
+        return wynik
+
+    return _z_ponowieniami(operacja, limiter, proby, opoznienie)
+
+
+def _zadanie_http(cgi: str, parametry: dict, url: str = None) -> urllib.request.Request:
+    """Buduje zapytanie POST do podanego narzędzia E-utilities."""
+    adres = f"{(url or URL_EUTILS).rstrip('/')}/{cgi}"
+    return urllib.request.Request(adres, data=urllib.parse.urlencode(_parametry(parametry), doseq=True).encode("ascii"))
+
+
+def _z_ponowieniami(operacja, limiter: LimiterZetonow = None, proby: int = 5, opoznienie: float = 1.0):
+    """Wykonuje operację sieciową z ogranicznikiem zapytań, ponawiając ją po błędach przejściowych."""
+    limiter = limiter or limiter_ncbi()
+    for proba in range(proby):
+        limiter.pobierz()  # Każda próba (również ponowiona) liczy się do limitu NCBI
+        try:
+            return operacja()
+        except urllib.error.HTTPError as blad:
+            if blad.code not in KODY_DO_PONOWIENIA or proba == proby - 1:
+                raise
+        except (urllib.error.URLError, OSError, http.client.HTTPException, ValueError, RuntimeError):  # ValueError: uszkodzony/niepełny XML
+            if proba == proby - 1:  # Błąd sieci lub uszkodzona odpowiedź po ostatniej próbie
+                raise
+        time.sleep(opoznienie * 2 ** proba)  # Rosnące opóźnienie przed ponowieniem
+
+
+class Historia:
+    """Wynik esearch z usehistory=y (liczba wyników i WebEnv/QueryKey do dalszych zapytań).
+
+    Wynik z pamięci podręcznej zawiera WebEnv z wcześniejszej sesji, który na serwerze mógł już wygasnąć,
+    dlatego przed pierwszym zapytaniem sieciowym korzystającym z historii wyszukiwanie jest ponawiane
+    (odswiez), co aktualizuje także liczbę wyników. Zapytania korzystające z historii mają w pamięci
+    podręcznej klucz oparty na term i migawce wyszukiwania (WebEnv wyniku esearch), więc strony
+    z różnych wyszukiwań nigdy nie są ze sobą łączone.
+    """
+
+    def __init__(self, db: str, term: str, pamiec: PamiecPodreczna = None, limiter: LimiterZetonow = None,
+                 url: str = None, **dodatkowe):
+        self.db = db
+        self.term = term
+        self._pamiec, self._limiter, self._url = pamiec, limiter, url
+        self._parametry_wyszukiwania = {"db": db, "term": term, "usehistory": "y", **dodatkowe}
+        self._blokada = threading.Lock()
+        tresc = pamiec.pobierz("esearch.fcgi", self._parametry_wyszukiwania) if pamiec is not None else None
+        self._z_pamieci = tresc is not None
+        wynik = Entrez.read(io.BytesIO(tresc)) if self._z_pamieci else self._wyszukaj()
+        self.liczba = int(wynik["Count"])
+        self._webenv, self._query_key = wynik.get("WebEnv"), wynik.get("QueryKey")
+
+    def _wyszukaj(self, zapisz: bool = True):
+        if not zapisz and self._pamiec is not None and self._pamiec.offline:
+            raise BrakWPamieciPodrecznej("Odświeżenie wyszukiwania wymaga sieci (tryb offline).")
+        return zapytanie("esearch.fcgi", self._parametry_wyszukiwania, self._limiter, self._url, parsuj=True,
+                         pamiec=self._pamiec if zapisz else None, pomin_odczyt=True)
+
+    @property
+    def z_pamieci(self) -> bool:
+        """Czy bieżący wynik wyszukiwania pochodzi z pamięci podręcznej (nie był jeszcze odświeżony)."""
+        return self._z_pamieci
+
+    @property
+    def migawka(self) -> str:
+        """Identyfikator bieżącego wyniku wyszukiwania (WebEnv) - zmienia się po odświeżeniu."""
+        return self._webenv
+
+    def odswiez(self, zapisz: bool = True):
+        """Ponawia wyszukiwanie, jeśli wynik pochodzi z pamięci podręcznej (nowy WebEnv, QueryKey i liczba).
+
+        Z zapisz=False nowy wynik nie zastępuje wpisu w pamięci podręcznej - kolejne uruchomienia nadal
+        korzystają z zapisanej migawki i stron zapisanych pod jej kluczem.
+        """
+        with self._blokada:
+            if self._z_pamieci:
+                wynik = self._wyszukaj(zapisz)
+                self.liczba = int(wynik["Count"])
+                self._webenv, self._query_key = wynik["WebEnv"], wynik["QueryKey"]
+                self._z_pamieci = False
+
+    def parametry(self) -> dict:
+        """Zwraca aktualne parametry webenv i query_key (odświeżając wynik pochodzący z pamięci podręcznej)."""
+        self.odswiez()
+        return {"webenv": self._webenv, "query_key": self._query_key}
+
+    def klucz(self, **parametry) -> dict:
+        """Klucz pamięci podręcznej zapytania korzystającego z historii (db, term i migawka zamiast WebEnv sesji)."""
+        return {"db": self.db, "term": self.term, "migawka": self._webenv, **parametry}
+
+
+def pobierz_podsumowania(historia: Historia, rozmiar_partii: int = 500, watki: int = None,
+                         limiter: LimiterZetonow = None, url: str = None, pamiec: PamiecPodreczna = None,
+                         proby: int = 5, opoznienie: float = 1.0):
+    """Pobiera esummary dla wszystkich historia.liczba rekordów wyszukiwania partiami po rozmiar_partii.
+
+    Partie pobierane są współbieżnie (watki, domyślnie tyle, ile zapytań na sekundę pozwala limit),
+    ale zwracane po kolei - generator oddaje listę rekordów każdej partii, gdy tylko będzie gotowa.
+    Jeśli wyszukiwanie pochodzi z pamięci podręcznej, a brakuje w niej którejkolwiek partii, wyszukiwanie
+    jest odświeżane przed pobraniem pierwszej partii, więc wszystkie partie dotyczą tego samego wyniku.
+    """
+    if rozmiar_partii <= 0:
+        raise ValueError("Rozmiar partii musi być dodatni.")
+    limiter = limiter or limiter_ncbi()
+    watki = watki or max(1, int(limiter.na_sekunde))
+
+    def okno(start, liczba):
+        return {"retstart": start, "retmax": min(rozmiar_partii, liczba - start)}
+
+    if historia.z_pamieci and (pamiec is None or not pamiec.offline and not all(
+            pamiec.zawiera("esummary.fcgi", historia.klucz(**okno(start, historia.liczba)))
+            for start in range(0, historia.liczba, rozmiar_partii))):
+        historia.odswiez()  # Potrzebna sieć - wszystkie partie z jednego, aktualnego wyszukiwania
+    liczba = historia.liczba
+    migawka = historia.migawka
+
+    def parametry_partii(okno_partii):
+        parametry = {"db": historia.db, **historia.parametry(), **okno_partii}
+        if historia.migawka != migawka:  # Odświeżenie w trakcie (np. wpis wygasł) - wyniki byłyby wymieszane
+            raise RuntimeError("Wynik wyszukiwania zmienił się w trakcie pobierania podsumowań - uruchom ponownie.")
+        return parametry
+
+    def partia(start):
+        okno_partii = okno(start, liczba)
+        return zapytanie("esummary.fcgi", lambda: parametry_partii(okno_partii), limiter, url, proby, opoznienie,
+                         parsuj=True, pamiec=pamiec, klucz=historia.klucz(**okno_partii))
+
+    with ThreadPoolExecutor(max_workers=watki) as pula:
+        w_toku = deque()  # Ograniczona liczba partii w toku - stała pamięć niezależnie od liczby wyników
+        for start in range(0, liczba, rozmiar_partii):
+            w_toku.append(pula.submit(partia, start))
+            if len(w_toku) >= 2 * watki:
+                yield w_toku.popleft().result()
+        while w_toku:
+            yield w_toku.popleft().result()
+
+
+class ZapisPodsumowan:
+    """Strumieniowy zapis podsumowań esummary do pliku CSV (kolumny a - accession, l - długość, d - opis).
+
+    Każda partia jest dopisywana do pliku od razu po nadejściu; równolegle w kopcu o rozmiarze n_najdluzszych
+    przechowywane są najdłuższe sekwencje (do wykresu), a liczba, suma, kwadraty, minimum, maksimum i histogram
+    długości (przedziały potęg dwójki) wyliczane są na bieżąco. Zużycie pamięci nie zależy od liczby rekordów.
+    """
+
+    def __init__(self, nazwa_pliku: str, n_najdluzszych: int = 20):
+        self.nazwa_pliku = nazwa_pliku
+        self.n_najdluzszych = n_najdluzszych
+        self.liczba = 0
+        self._suma = 0
+        self._suma_kwadratow = 0
+        self._min = None
+        self._max = None
+        self._histogram = {}  # Wykładnik k -> liczba długości z przedziału [2^(k-1), 2^k)
+        self._kopiec = []  # (długość, -numer rekordu, accession) - na szczycie najkrótsza z najdłuższych
+        self._plik = open(nazwa_pliku, 'w', newline='', encoding='utf-8')
+        self._pisarz = csv.writer(self._plik, lineterminator="\n")
+        self._pisarz.writerow("ald")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *wyjatek):
+        self.zamknij()
+
+    def dodaj(self, partia):
+        """Dopisuje partię podsumowań (słowników DocSum) do pliku i aktualizuje statystyki."""
+        for podsumowanie in partia:
+            accession = podsumowanie.get("AccessionVersion")
+            dlugosc = int(podsumowanie.get("Length", podsumowanie.get("slen", 0)))
+            self._pisarz.writerow([accession, dlugosc, podsumowanie.get("Title")])
+            wpis = (dlugosc, -self.liczba, accession)  # Przy równej długości wygrywa wcześniejszy rekord
+            if len(self._kopiec) < self.n_najdluzszych:
+                heapq.heappush(self._kopiec, wpis)
+            elif wpis > self._kopiec[0]:
+                heapq.heapreplace(self._kopiec, wpis)
+            self.liczba += 1
+            self._suma += dlugosc
+            self._suma_kwadratow += dlugosc * dlugosc
+            self._min = dlugosc if self._min is None else min(self._min, dlugosc)
+            self._max = dlugosc if self._max is None else max(self._max, dlugosc)
+            self._histogram[dlugosc.bit_length()] = self._histogram.get(dlugosc.bit_length(), 0) + 1
+        self._plik.flush()  # Zapisane partie pozostają w pliku nawet po przerwaniu programu
+
+    def najdluzsze(self) -> list:
+        """Zwraca listę (accession, długość) najdłuższych sekwencji, od najdłuższej."""
+        return [(accession, dlugosc) for dlugosc, _, accession in sorted(self._kopiec, reverse=True)]
+
+    def statystyki(self) -> dict:
+        """Zwraca statystyki rozkładu długości: liczba, suma, min, max, średnia, odchylenie standardowe
+        oraz histogram {dolna granica przedziału: liczba rekordów}."""
+        srednia = self._suma / self.liczba if self.liczba else None
+        odchylenie = (max(self._suma_kwadratow / self.liczba - srednia * srednia, 0) ** 0.5) if self.liczba else None
+        histogram = {(1 << wykladnik >> 1): liczba for wykladnik, liczba in sorted(self._histogram.items())}
+        return {"liczba": self.liczba, "suma": self._suma, "min": self._min, "max": self._max,
+                "srednia": srednia, "odchylenie": odchylenie, "histogram": histogram}
+
+    def zamknij(self):
+        """Zamyka plik CSV."""
+        if not self._plik.closed:
+            self._plik.close()
+
+
+def _zapisz_punkt_kontrolny(sciezka: str, stan: dict):
+    """Zapisuje stan pobierania atomowo (plik tymczasowy + os.replace)."""
+    tymczasowy = f"{sciezka}.tmp"
+    with open(tymczasowy, 'w', encoding='utf-8') as plik:
+        json.dump(stan, plik, indent=1)
+        plik.flush()
+        os.fsync(plik.fileno())
+    os.replace(tymczasowy, sciezka)
+
+
+def _kopiuj_rekordy(zrodlo, cel) -> int:
+    """Kopiuje odpowiedź efetch porcjami i zwraca liczbę kompletnych rekordów GenBank (zakończonych linią '//')."""
+    liczba_rekordow = 0
+    poprzedni_koniec = b"\n"  # Początek odpowiedzi traktowany jak początek linii
+    while True:
+        porcja = zrodlo.read(ROZMIAR_BUFORA_STRUMIENIA)
+        if not porcja:
+            return liczba_rekordow
+        cel.write(porcja)
+        liczba_rekordow += (poprzedni_koniec + porcja[:2]).count(b"\n//") + porcja.count(b"\n//")
+        poprzedni_koniec = (poprzedni_koniec + porcja)[-2:]  # "\n//" może być rozcięte między porcjami
+
+
+def pobierz_genbank(historia: Historia, prefiks: str, rozmiar_partii: int = 500, kompresja: bool = False,
+                    rekordow_na_plik: int = None, limit: int = None, limiter: LimiterZetonow = None, url: str = None,
+                    proby: int = 5, opoznienie: float = 1.0, poziom_kompresji: int = POZIOM_KOMPRESJI) -> list:
+    """Pobiera rekordy GenBank wyszukiwania strumieniowo na dysk, partiami po rozmiar_partii.
+
+    Wynik trafia do pliku prefiks.gb (lub prefiks.NNNN.gb przy podziale po rekordow_na_plik rekordów,
+    z rozszerzeniem .gz przy kompresji na poziomie poziom_kompresji). Po każdej partii zapisywany jest punkt kontrolny
+    prefiks.postep.json - ponowne wywołanie z tymi samymi parametrami wznawia pobieranie od pierwszej
+    niezapisanej partii. Po ostatniej partii punkt kontrolny jest usuwany, więc kolejne wywołanie pobiera
+    rekordy od nowa. Zwraca listę zapisanych plików.
+    """
+    if rozmiar_partii <= 0 or (rekordow_na_plik is not None and rekordow_na_plik <= 0):
+        raise ValueError("Rozmiar partii i liczba rekordów na plik muszą być dodatnie.")
+    historia.odswiez(zapisz=False)  # efetch zawsze korzysta z sieci; zapisana migawka zostaje dla esummary
+    liczba = historia.liczba if limit is None else min(limit, historia.liczba)
+    rozszerzenie = ".gb.gz" if kompresja else ".gb"
+    sciezka_postepu = f"{prefiks}.postep.json"
+    parametry_pobierania = {"db": historia.db, "term": historia.term, "liczba": liczba, "rozmiar_partii": rozmiar_partii,
+                            "kompresja": kompresja, "rekordow_na_plik": rekordow_na_plik}
+    stan = dict(parametry_pobierania, nastepny_start=0, plik=None, rozmiar_pliku=0, pliki=[])
+    if os.path.exists(sciezka_postepu):  # Wznowienie przerwanego pobierania
+        with open(sciezka_postepu, encoding='utf-8') as plik_postepu:
+            zapisany = json.load(plik_postepu)
+        if zapisany.get("nastepny_start", 0) >= zapisany.get("liczba", 0):  # Zakończone pobieranie - od nowa
+            zapisany = None
+        elif any(zapisany.get(klucz) != wartosc for klucz, wartosc in parametry_pobierania.items()):
+            raise ValueError(f"Punkt kontrolny {sciezka_postepu} dotyczy innego pobierania - usuń go, aby zacząć od nowa.")
+        stan = zapisany or stan
+
+    def nazwa_pliku(start):
+        if rekordow_na_plik is None:
+            return f"{prefiks}{rozszerzenie}"
+        return f"{prefiks}.{start // rekordow_na_plik:04d}{rozszerzenie}"
+
+    plik = None
+    try:
+        if stan["plik"] is not None:  # Odrzucenie danych niedokończonej partii z przerwanego uruchomienia
+            plik = open(stan["plik"], 'r+b')
+            plik.truncate(stan["rozmiar_pliku"])
+        start = stan["nastepny_start"]
+        while start < liczba:
+            nazwa = nazwa_pliku(start)
+            if nazwa != stan["plik"]:  # Początek nowego pliku (shardu)
+                if plik is not None:
+                    plik.close()
+                plik = open(nazwa, 'w+b')
+                stan.update(plik=nazwa, rozmiar_pliku=0)
+                stan["pliki"].append(nazwa)
+            koniec = min(liczba, start + rozmiar_partii)
+            if rekordow_na_plik is not None:  # Partia nie przekracza granicy pliku
+                koniec = min(koniec, (start // rekordow_na_plik + 1) * rekordow_na_plik)
+            okno = {"rettype": "gb", "retmode": "text", "retstart": start, "retmax": koniec - start}
+
+            def partia(okno=okno):
+                plik.seek(stan["rozmiar_pliku"])
+                plik.truncate()  # Usunięcie ewentualnej części nieudanej próby
+                zadanie = _zadanie_http("efetch.fcgi", {"db": historia.db, **historia.parametry(), **okno}, url)
+                with urllib.request.urlopen(zadanie, timeout=600) as odpowiedz:
+                    if kompresja:  # Każda partia to osobny człon gzip - poprawny plik także po wznowieniu
+                        with gzip.GzipFile(fileobj=plik, mode='wb', compresslevel=poziom_kompresji,
+                                           mtime=0) as cel:
+                            liczba_rekordow = _kopiuj_rekordy(odpowiedz, cel)
+                    else:
+                        liczba_rekordow = _kopiuj_rekordy(odpowiedz, plik)
+                if liczba_rekordow != koniec - start:  # Pusta, błędna lub urwana odpowiedź - ponowienie partii
+                    raise ValueError(f"Odpowiedź efetch dla rekordów {start}-{koniec} zawiera {liczba_rekordow} "
+                                     f"kompletnych rekordów zamiast {koniec - start}.")
+                plik.flush()
+                os.fsync(plik.fileno())
+
+            _z_ponowieniami(partia, limiter, proby, opoznienie)
+            start = koniec
+            stan.update(nastepny_start=start, rozmiar_pliku=plik.tell())
+            _zapisz_punkt_kontrolny(sciezka_postepu, stan)
+    finally:
+        if plik is not None:
+            plik.close()
+    if os.path.exists(sciezka_postepu):  # Pobieranie zakończone - nie ma czego wznawiać
+        os.remove(sciezka_postepu)
+    return stan["pliki"]
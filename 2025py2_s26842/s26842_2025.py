@@ -1,26 +1,32 @@
-import time,pylab as Y,pandas as D;from Bio import Entrez
-p=print;e=input("E:");k=input("K:")or None;i=input("TID:")
+import time;T=time.perf_counter();from Bio import Entrez
+p=print;p(f"Imp:{time.perf_counter()-T:.3f}s");e=input("E:");k=input("K:")or None;i=input("TID:")
 n=input("MinL:");m=int(n)if n.isdigit()else None
 x=input("MaxL:");M=int(x)if x.isdigit()else None
-Entrez.email,Entrez.api_key,Entrez.tool=e,k,'M';W,Q,C,N=None,None,0,""
-time.sleep(.34);h=Entrez.efetch(db="taxonomy",id=i,retmode="xml");R=Entrez.read(h);h.close();N=R[0]["ScientificName"];p(f"O:{N}({i})")
+y=input("Bat:");B=int(y)if y.isdigit()and int(y)>0 else 500
+g=input("GBN:");q=input("GBZ:").lower()in("y","t");h=input("GBS:");Q=int(h)if h.isdigit()and int(h)>0 else None
+Entrez.email,Entrez.api_key,Entrez.tool=e,k,'M';C,N=0,""
+from eutils_s26842 import zapytanie as Z,Historia as HI,pobierz_podsumowania as PS,pamiec_ze_srodowiska as PZ,ZapisPodsumowan as ZP;P=PZ()
+R=Z("efetch.fcgi",{"db":"taxonomy","id":i,"retmode":"xml"},parsuj=1,pamiec=P);N=R[0]["ScientificName"];p(f"O:{N}({i})")
 l=""
 if m!=None and M!=None:l=f" AND {m}:{M if M>=m else'9'*10}[SLEN]"
 elif m!=None:l=f" AND {m}:{'9'*10}[SLEN]"
 elif M!=None:l=f" AND 1:{M}[SLEN]"
 s=f"txid{i}[Organism]{l}";p(f"Q:{s}")
-time.sleep(.34);h=Entrez.esearch(db="nucleotide",term=s,usehistory="y",idtype="acc");r=Entrez.read(h);h.close();C=int(r["Count"])
+H=HI("nucleotide",s,P,idtype="acc");C=H.liczba
 if C<1:p(f"No r {N}");exit()
-p(f"{C}r");W,Q=r["WebEnv"],r["QueryKey"]
-d=[];F=min(C,200);p(f"S:{F}")
-time.sleep(.34);h=Entrez.esummary(db="nucleotide",webenv=W,query_key=Q,retstart=0,retmax=F);S=Entrez.read(h);h.close()
-for e in S:d+=[{"a":e.get("AccessionVersion"),"l":int(e.get("Length",e.get("slen",0))),"d":e.get("Title")}]
-if not d:p("No sum");exit()
-b=i;D.DataFrame(d).to_csv(f"{b}r.csv",index=0);p(f"CSV:{b}r.csv");
-f=D.DataFrame(d).sort_values("l", ascending=0)[:20]
-Y.plot(f["a"],f["l"],"o-");Y.xlabel("A");Y.ylabel("L");Y.title(f"N:{len(f)}")
+p(f"{C}r")
+b=i;p(f"S:{C} B:{B}")
+with ZP(f"{b}r.csv",20)as W:
+ for S in PS(H,B,pamiec=P):W.dodaj(S)
+if not W.liczba:p("No sum");exit()
+p(f"CSV:{b}r.csv");f=W.najdluzsze();L=W.statystyki();p(f"L:{L['min']}-{L['max']} avg {L['srednia']:.0f} sd {L['odchylenie']:.0f}")
+p("H:"+" ".join(f"{u}:{v}"for u,v in L["histogram"].items()))
+import matplotlib as X;X.use("Agg");import matplotlib.pyplot as Y
+Y.plot([r[0]for r in f],[r[1]for r in f],"o-");Y.xlabel("A");Y.ylabel("L");Y.title(f"N:{len(f)}")
 Y.xticks(rotation=90,fontsize=6);Y.tight_layout();Y.savefig(f"{b}p.png");Y.close();p(f"Plot:{b}p.png")
-a=min(C,3);t=""
-if a>0:p(f"GB:{a}");time.sleep(.34);h=Entrez.efetch(db="nucleotide",rettype="gb",retmode="text",retmax=a,webenv=W,query_key=Q);t=h.read();h.close()
+C=H.liczba;a=C if g=="a"else min(C,int(g))if g.isdigit()else min(C,3);t=""
+if a>3 or q or Q:from eutils_s26842 import pobierz_genbank as PG;p(f"GB:{a}");p("F:"+",".join(PG(H,f"{b}s",B,q,Q,a)))
+elif a>0:p(f"GB:{a}");o=dict(rettype="gb",retmode="text",retstart=0,retmax=a);t=Z("efetch.fcgi",lambda:{"db":"nucleotide",**H.parametry(),**o},pamiec=P,klucz=lambda:H.klucz(**o)).decode()
 if t:
- with open(f"{b}s.gb","w")as z:z.write(t)
\ No newline at end of file
+ with open(f"{b}s.gb","w")as z:z.write(t)
+p(f"T:{time.perf_counter()-T:.2f}s")
\ No newline at end of file
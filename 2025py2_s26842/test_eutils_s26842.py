@@ -0,0 +1,143 @@
+# Testy modułu eutils_s26842.py na lokalnej atrapie E-utilities (atrapa_eutils_s26842.py), bez dostępu do sieci.
+# Uruchomienie: python -m pytest -q test_eutils_s26842.py
+
+import gzip
+import os
+import sys
+
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))  # Import modułów z tego samego katalogu
+pytest.importorskip("Bio")  # eutils_s26842 wymaga biopython (Bio.Entrez)
+
+import eutils_s26842 as eutils  # noqa: E402
+from atrapa_eutils_s26842 import AtrapaEutils, dlugosc_rekordu  # noqa: E402
+
+TERM = "txid9606[Organism]"
+
+
+@pytest.fixture
+def atrapa():
+    with AtrapaEutils(liczba=2345) as serwer:
+        yield serwer
+
+
+@pytest.fixture
+def limiter():
+    return eutils.LimiterZetonow(1000, pojemnosc=1000)  # Bez czekania - atrapa nie ma limitu zapytań
+
+
+def _podsumowania(historia, atrapa, limiter, **parametry):
+    wiersze = []
+    for partia in eutils.pobierz_podsumowania(historia, limiter=limiter, url=atrapa.url, opoznienie=0.01, **parametry):
+        wiersze.extend((podsumowanie["AccessionVersion"], int(podsumowanie["Length"])) for podsumowanie in partia)
+    return wiersze
+
+
+def test_stronicowanie_zwraca_wszystkie_rekordy_po_kolei(atrapa, limiter):
+    historia = eutils.Historia("nucleotide", TERM, limiter=limiter, url=atrapa.url)
+    wiersze = _podsumowania(historia, atrapa, limiter, rozmiar_partii=500, watki=4)
+    assert historia.liczba == 2345
+    assert wiersze == [(f"MOCK{numer:06d}.1", dlugosc_rekordu(numer)) for numer in range(2345)]
+    assert atrapa.liczba_zapytan("esummary.fcgi") == 5
+
+
+def test_bledy_503_sa_ponawiane(atrapa, limiter):
+    atrapa.bledy += [("esummary.fcgi", 500, 503), ("esummary.fcgi", 500, 503), ("esummary.fcgi", 2000, 502)]
+    historia = eutils.Historia("nucleotide", TERM, limiter=limiter, url=atrapa.url)
+    wiersze = _podsumowania(historia, atrapa, limiter, rozmiar_partii=500)
+    assert [wiersz[0] for wiersz in wiersze] == [f"MOCK{numer:06d}.1" for numer in range(2345)]
+    assert atrapa.liczba_zapytan("esummary.fcgi") == 5 + 3
+    assert not atrapa.bledy
+
+
+def test_blad_bez_ponowienia_przerywa_pobieranie(atrapa, limiter):
+    atrapa.bledy.append(("esummary.fcgi", 1000, 400))
+    historia = eutils.Historia("nucleotide", TERM, limiter=limiter, url=atrapa.url)
+    with pytest.raises(eutils.urllib.error.HTTPError):
+        _podsumowania(historia, atrapa, limiter, rozmiar_partii=500)
+
+
+def _rekordy_w_plikach(pliki):
+    tekst = ""
+    for nazwa in pliki:
+        with (gzip.open(nazwa, 'rt') if nazwa.endswith(".gz") else open(nazwa)) as plik:
+            tekst += plik.read()
+    return [linia.split()[1] for linia in tekst.splitlines() if linia.startswith("ACCESSION")]
+
+
+def test_pobieranie_genbank_wznawiane_po_przerwaniu(atrapa, limiter, tmp_path):
+    historia = eutils.Historia("nucleotide", TERM, limiter=limiter, url=atrapa.url)
+    prefiks = str(tmp_path / "gb")
+    atrapa.bledy.append(("efetch.fcgi", 1000, 400))  # Trwały błąd trzeciej partii - przerwanie pobierania
+    with pytest.raises(eutils.urllib.error.HTTPError):
+        eutils.pobierz_genbank(historia, prefiks, 500, limiter=limiter, url=atrapa.url, opoznienie=0.01)
+    assert os.path.exists(f"{prefiks}.postep.json")
+    przed_wznowieniem = atrapa.liczba_zapytan("efetch.fcgi")
+    pliki = eutils.pobierz_genbank(historia, prefiks, 500, limiter=limiter, url=atrapa.url, opoznienie=0.01)
+    assert atrapa.liczba_zapytan("efetch.fcgi") - przed_wznowieniem == 3  # Tylko partie 1000, 1500 i 2000
+    assert _rekordy_w_plikach(pliki) == [f"MOCK{numer:06d}" for numer in range(2345)]
+    assert not os.path.exists(f"{prefiks}.postep.json")
+
+
+def test_pobieranie_genbank_gzip_w_plikach_czesciowych(atrapa, limiter, tmp_path):
+    historia = eutils.Historia("nucleotide", TERM, limiter=limiter, url=atrapa.url)
+    atrapa.bledy.append(("efetch.fcgi", 400, 503))  # Ponowiona partia nie może zostawić danych w pliku
+    pliki = eutils.pobierz_genbank(historia, str(tmp_path / "gb"), 300, kompresja=True, rekordow_na_plik=1000,
+                                   limit=2100, limiter=limiter, url=atrapa.url, opoznienie=0.01)
+    assert [os.path.basename(nazwa) for nazwa in pliki] == ["gb.0000.gb.gz", "gb.0001.gb.gz", "gb.0002.gb.gz"]
+    assert _rekordy_w_plikach(pliki) == [f"MOCK{numer:06d}" for numer in range(2100)]
+    assert len(_rekordy_w_plikach(pliki[:1])) == 1000
+
+
+def test_ponowne_pobieranie_po_zakonczeniu_zaczyna_od_nowa(atrapa, limiter, tmp_path):
+    prefiks = str(tmp_path / "gb")
+    historia = eutils.Historia("nucleotide", TERM, limiter=limiter, url=atrapa.url)
+    eutils.pobierz_genbank(historia, prefiks, 1000, limiter=limiter, url=atrapa.url)
+    atrapa.liczba = 2400  # Liczba wyników zmieniła się między uruchomieniami
+    historia = eutils.Historia("nucleotide", TERM, limiter=limiter, url=atrapa.url)
+    pliki = eutils.pobierz_genbank(historia, prefiks, 1000, limiter=limiter, url=atrapa.url)
+    assert len(_rekordy_w_plikach(pliki)) == 2400
+
+
+def _uruchomienie_zbiorcze(atrapa, limiter, pamiec, prefiks):
+    """Przebieg jak w skrypcie: esearch, wszystkie podsumowania, pobranie GenBank; zwraca liczbę zapytań esummary."""
+    przed = atrapa.liczba_zapytan("esummary.fcgi")
+    historia = eutils.Historia("nucleotide", TERM, pamiec, limiter, atrapa.url)
+    wiersze = _podsumowania(historia, atrapa, limiter, rozmiar_partii=1000, pamiec=pamiec)
+    eutils.pobierz_genbank(historia, prefiks, 1000, limit=10, limiter=limiter, url=atrapa.url)
+    return len(wiersze), atrapa.liczba_zapytan("esummary.fcgi") - przed
+
+
+def test_kolejne_uruchomienia_zbiorcze_korzystaja_z_pamieci(atrapa, limiter, tmp_path):
+    pamiec = eutils.PamiecPodreczna(str(tmp_path / "pamiec"))
+    prefiks = str(tmp_path / "gb")
+    assert _uruchomienie_zbiorcze(atrapa, limiter, pamiec, prefiks) == (2345, 3)
+    assert _uruchomienie_zbiorcze(atrapa, limiter, pamiec, prefiks) == (2345, 0)
+    assert _uruchomienie_zbiorcze(atrapa, limiter, pamiec, prefiks) == (2345, 0)
+
+
+def test_tryb_offline_odtwarza_wyniki_bez_sieci(atrapa, limiter, tmp_path):
+    katalog = str(tmp_path / "pamiec")
+    pamiec = eutils.PamiecPodreczna(katalog)
+    historia = eutils.Historia("nucleotide", TERM, pamiec, limiter, atrapa.url)
+    wiersze = _podsumowania(historia, atrapa, limiter, rozmiar_partii=500, pamiec=pamiec)
+    liczba_zapytan = len(atrapa.zapytania)
+    offline = eutils.PamiecPodreczna(katalog, offline=True)
+    historia = eutils.Historia("nucleotide", TERM, offline, limiter, atrapa.url)
+    assert _podsumowania(historia, atrapa, limiter, rozmiar_partii=500, pamiec=offline) == wiersze
+    assert len(atrapa.zapytania) == liczba_zapytan
+    with pytest.raises(eutils.BrakWPamieciPodrecznej):
+        _podsumowania(historia, atrapa, limiter, rozmiar_partii=400, pamiec=offline)
+
+
+def test_zmiana_liczby_wynikow_nie_miesza_stron(atrapa, limiter, tmp_path):
+    pamiec = eutils.PamiecPodreczna(str(tmp_path / "pamiec"))
+    historia = eutils.Historia("nucleotide", TERM, pamiec, limiter, atrapa.url)
+    assert len(_podsumowania(historia, atrapa, limiter, rozmiar_partii=500, pamiec=pamiec)) == 2345
+    atrapa.liczba = 2400
+    historia = eutils.Historia("nucleotide", TERM, pamiec, limiter, atrapa.url)
+    assert historia.liczba == 2345  # Wyszukiwanie z pamięci podręcznej
+    wiersze = _podsumowania(historia, atrapa, limiter, rozmiar_partii=400, pamiec=pamiec)  # Brak stron - odświeżenie
+    assert historia.liczba == 2400
+    assert [wiersz[0] for wiersz in wiersze] == [f"MOCK{numer:06d}.1" for numer in range(2400)]
@@ -0,0 +1,201 @@
+# Benchmark i test regresji pamięci dla generatora sekwencji DNA (s26842_2025.py).
+
+# Cel programu:
+# Pomiar czasu działania, przepustowości (bp/s) i szczytowego zużycia pamięci najważniejszych funkcji
+# generatora: generuj_sekwencje_dna, oblicz_statystyki, wstaw_imie, zapisz_do_fasta oraz całego potoku
+# generowanie -> statystyki -> wstawienie imienia -> zapis, dla sekwencji od 10^3 do 10^8 bp.
+# Wyniki zapisywane są do pliku JSON, który można porównać z zapisanym wcześniej wynikiem bazowym;
+# przekroczenie progu kończy program kodem błędu (przydatne w automatycznych testach).
+# Każdy pomiar czasu powtarza wywołanie, aż trwa co najmniej MIN_CZAS_POMIARU (jak timeit.autorange),
+# a regresja zgłaszana jest dopiero, gdy wzrost przekracza zarówno próg względny, jak i bezwzględny.
+# Program działa bez interfejsu graficznego i bez dostępu do sieci.
+
+# Przykłady:
+#   python benchmark_s26842_2025.py --wyjscie bazowy.json
+#   python benchmark_s26842_2025.py --rozmiary 1e3,1e5,1e7 --porownaj bazowy.json --prog-czasu 1.3
+
+import argparse  # Obsługa argumentów linii poleceń
+import json  # Zapis i odczyt wyników w formacie JSON
+import os  # Ścieżki plików i zmienne środowiskowe
+import platform  # Informacje o systemie zapisywane razem z wynikami
+import shutil  # Usuwanie katalogu tymczasowego
+import sys  # Ścieżka importu i kod wyjścia
+import tempfile  # Katalog tymczasowy na zapisywane pliki FASTA
+import time  # Pomiar czasu (perf_counter)
+import tracemalloc  # Pomiar szczytowego zużycia pamięci (obejmuje także tablice numpy)
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))  # Import modułu z tego samego katalogu
+import s26842_2025 as generator  # noqa: E402 - import po ustawieniu ścieżki
+
+DOMYSLNE_ROZMIARY = [10 ** wykladnik for wykladnik in range(3, 9)]  # 10^3 ... 10^8 bp
+ZIARNO = 26842  # Stałe ziarno - każdy pomiar działa na tych samych danych
+IMIE = "Gemini"  # Imię wstawiane w benchmarkach wstaw_imie i potoku
+MIN_CZAS_POMIARU = 0.05  # Minimalny czas jednej serii wywołań w sekundach (krótsze pomiary są zbyt zaszumione)
+MIN_ROZNICA_CZASU = 1e-3  # Domyślny bezwzględny wzrost czasu (s) poniżej którego nie zgłasza się regresji
+MIN_ROZNICA_PAMIECI = 1 << 16  # Domyślny bezwzględny wzrost pamięci (B) poniżej którego nie zgłasza się regresji
+
+
+def _przypadki(katalog: str) -> dict:
+    """Zwraca słownik: nazwa przypadku -> (funkcja przygotowania danych, funkcja mierzona)."""
+    plik_fasta = os.path.join(katalog, "benchmark.fasta")
+
+    def sekwencja(rozmiar):
+        return generator.generuj_sekwencje_dna(rozmiar, ZIARNO)
+
+    def sekwencja_2bit(rozmiar):
+        return generator.SekwencjaDNA2bit.generuj(rozmiar, ZIARNO)
+
+    def potok(rozmiar):
+        czysta = generator.generuj_sekwencje_dna(rozmiar, ZIARNO)
+        generator.oblicz_statystyki(czysta)
+        generator.zapisz_do_fasta(plik_fasta, "bench", "potok", generator.wstaw_imie(czysta, IMIE, rozmiar // 2))
+
+    def potok_2bit(rozmiar):
+        czysta = generator.SekwencjaDNA2bit.generuj(rozmiar, ZIARNO)
+        generator.oblicz_statystyki(czysta)
+        generator.zapisz_do_fasta(plik_fasta, "bench", "potok", generator.wstaw_imie(czysta, IMIE, rozmiar // 2))
+
+    przypadki = {
+        'generuj_sekwencje_dna': (lambda rozmiar: rozmiar,
+                                  lambda rozmiar: generator.generuj_sekwencje_dna(rozmiar, ZIARNO)),
+        'oblicz_statystyki': (sekwencja, generator.oblicz_statystyki),
+        'wstaw_imie': (sekwencja, lambda dane: generator.wstaw_imie(dane, IMIE, len(dane) // 2)),
+        'zapisz_do_fasta': (sekwencja, lambda dane: generator.zapisz_do_fasta(plik_fasta, "bench", "zapis", dane)),
+        'potok': (lambda rozmiar: rozmiar, potok),
+    }
+    if generator.NUMPY_AVAILABLE:  # Wariant z sekwencją 2-bitową wymaga numpy
+        przypadki['potok_2bit'] = (lambda rozmiar: rozmiar, potok_2bit)
+        przypadki['oblicz_statystyki_2bit'] = (sekwencja_2bit, generator.oblicz_statystyki)
+    return przypadki
+
+
+def _seria(funkcja, dane, liczba_wywolan: int) -> float:
+    """Zwraca łączny czas liczba_wywolan kolejnych wywołań funkcja(dane)."""
+    start = time.perf_counter()
+    for _ in range(liczba_wywolan):
+        funkcja(dane)
+    return time.perf_counter() - start
+
+
+def zmierz(funkcja, dane, powtorzenia: int) -> tuple:
+    """Zwraca (najlepszy czas jednego wywołania w sekundach, szczytowa pamięć w bajtach) dla funkcja(dane).
+
+    Liczba wywołań w serii rośnie (1, 2, 5, 10, 20, 50...), aż seria trwa co najmniej MIN_CZAS_POMIARU;
+    wynikiem jest najlepszy średni czas wywołania z powtorzenia takich serii.
+    """
+    liczba_wywolan, mnozniki = 1, (2, 2.5, 2)  # Kolejne liczby wywołań jak w timeit.autorange
+    krok = 0
+    czas_serii = _seria(funkcja, dane, liczba_wywolan)
+    while czas_serii < MIN_CZAS_POMIARU:
+        liczba_wywolan = int(liczba_wywolan * mnozniki[krok % 3])
+        krok += 1
+        czas_serii = _seria(funkcja, dane, liczba_wywolan)
+    najlepszy_czas = czas_serii / liczba_wywolan
+    for _ in range(powtorzenia - 1):  # Czas mierzony bez tracemalloc, który spowalnia alokacje
+        najlepszy_czas = min(najlepszy_czas, _seria(funkcja, dane, liczba_wywolan) / liczba_wywolan)
+    tracemalloc.start()  # Osobne wywołanie do pomiaru pamięci
+    try:
+        funkcja(dane)
+        pamiec_szczytowa = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return najlepszy_czas, pamiec_szczytowa
+
+
+def uruchom_benchmark(rozmiary: list, przypadki: list = None, powtorzenia: int = 5) -> dict:
+    """Wykonuje pomiary dla podanych rozmiarów i przypadków; zwraca wyniki gotowe do zapisu w JSON."""
+    katalog = tempfile.mkdtemp(prefix="benchmark_s26842_")
+    wyniki = []
+    try:
+        wszystkie = _przypadki(katalog)
+        for nazwa in przypadki or list(wszystkie):
+            if nazwa not in wszystkie:
+                raise ValueError(f"Nieznany przypadek benchmarku: {nazwa} (dostępne: {', '.join(wszystkie)}).")
+            przygotuj, funkcja = wszystkie[nazwa]
+            for rozmiar in rozmiary:
+                dane = przygotuj(rozmiar)  # Przygotowanie danych poza pomiarem
+                czas, pamiec = zmierz(funkcja, dane, powtorzenia)
+                del dane
+                wyniki.append({'przypadek': nazwa, 'rozmiar': rozmiar, 'czas_s': czas,
+                               'bp_na_s': rozmiar / czas if czas > 0 else None, 'pamiec_szczytowa_B': pamiec})
+                print(f"{nazwa:<24} {rozmiar:>12} bp  {czas:10.4f} s  "
+                      f"{rozmiar / max(czas, 1e-12):14.0f} bp/s  {pamiec / 2 ** 20:10.1f} MiB")
+    finally:
+        shutil.rmtree(katalog, ignore_errors=True)
+    return {
+        'meta': {
+            'python': platform.python_version(),
+            'numpy': generator.np.__version__ if generator.NUMPY_AVAILABLE else None,
+            'system': platform.platform(),
+            'procesor': platform.processor() or platform.machine(),
+            'powtorzenia': powtorzenia,
+            'min_czas_pomiaru_s': MIN_CZAS_POMIARU,
+            'matplotlib_zaladowany': 'matplotlib' in sys.modules,  # Benchmark nie powinien importować matplotlib
+            'data': time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        'wyniki': wyniki,
+    }
+
+
+def porownaj_z_bazowym(wyniki: dict, bazowe: dict, prog_czasu: float, prog_pamieci: float,
+                       min_roznica_czasu: float = MIN_ROZNICA_CZASU, min_roznica_pamieci: int = MIN_ROZNICA_PAMIECI) -> list:
+    """Zwraca listę opisów regresji: pomiarów, których czas lub pamięć przekracza wynik bazowy o więcej niż próg
+    (krotność) i jednocześnie o więcej niż bezwzględna minimalna różnica (szum przy bardzo krótkich pomiarach)."""
+    bazowe_pomiary = {(pomiar['przypadek'], pomiar['rozmiar']): pomiar for pomiar in bazowe['wyniki']}
+    regresje = []
+    for pomiar in wyniki['wyniki']:
+        bazowy = bazowe_pomiary.get((pomiar['przypadek'], pomiar['rozmiar']))
+        if bazowy is None:  # Nowy przypadek lub rozmiar - brak punktu odniesienia
+            continue
+        for klucz, prog, minimum, jednostka in (('czas_s', prog_czasu, min_roznica_czasu, 's'),
+                                                ('pamiec_szczytowa_B', prog_pamieci, min_roznica_pamieci, 'B')):
+            if bazowy[klucz] and pomiar[klucz] > bazowy[klucz] * prog and pomiar[klucz] - bazowy[klucz] > minimum:
+                regresje.append(f"{pomiar['przypadek']} ({pomiar['rozmiar']} bp): {klucz} "
+                                f"{pomiar[klucz]:.4g} {jednostka} > {prog} x {bazowy[klucz]:.4g} {jednostka}")
+    return regresje
+
+
+def _parsuj_rozmiary(tekst: str) -> list:
+    """Zamienia listę rozmiarów w postaci '1e3,1e5,250000' na liczby całkowite."""
+    return [int(float(element)) for element in tekst.split(',') if element.strip()]
+
+
+def main(argumenty: list = None) -> int:
+    """Uruchamia benchmark z linii poleceń; zwraca kod wyjścia (1 w przypadku regresji)."""
+    parser = argparse.ArgumentParser(description="Benchmark generatora sekwencji DNA (czas, bp/s, pamięć).")
+    parser.add_argument('--rozmiary', type=_parsuj_rozmiary, default=DOMYSLNE_ROZMIARY,
+                        help="Rozmiary sekwencji oddzielone przecinkami (domyślnie 1e3,...,1e8).")
+    parser.add_argument('--przypadki', help="Mierzone przypadki oddzielone przecinkami (domyślnie wszystkie).")
+    parser.add_argument('--powtorzenia', type=int, default=5, help="Liczba serii pomiaru czasu (najlepszy wynik).")
+    parser.add_argument('--wyjscie', default="benchmark_wyniki.json", help="Plik JSON z wynikami.")
+    parser.add_argument('--porownaj', help="Plik JSON z wynikami bazowymi do porównania.")
+    parser.add_argument('--prog-czasu', type=float, default=1.25, help="Dopuszczalny wzrost czasu (krotność).")
+    parser.add_argument('--prog-pamieci', type=float, default=1.25, help="Dopuszczalny wzrost pamięci (krotność).")
+    parser.add_argument('--min-roznica-czasu', type=float, default=MIN_ROZNICA_CZASU,
+                        help="Bezwzględny wzrost czasu (s), poniżej którego nie zgłasza się regresji.")
+    parser.add_argument('--min-roznica-pamieci', type=int, default=MIN_ROZNICA_PAMIECI,
+                        help="Bezwzględny wzrost pamięci (B), poniżej którego nie zgłasza się regresji.")
+    argumenty = parser.parse_args(argumenty)
+
+    przypadki = argumenty.przypadki.split(',') if argumenty.przypadki else None
+    wyniki = uruchom_benchmark(argumenty.rozmiary, przypadki, argumenty.powtorzenia)
+    with open(argumenty.wyjscie, 'w', encoding='utf-8') as plik:
+        json.dump(wyniki, plik, indent=2)
+    print(f"Wyniki zapisano do pliku {argumenty.wyjscie}")
+
+    if argumenty.porownaj:
+        with open(argumenty.porownaj, encoding='utf-8') as plik:
+            bazowe = json.load(plik)
+        regresje = porownaj_z_bazowym(wyniki, bazowe, argumenty.prog_czasu, argumenty.prog_pamieci,
+                                      argumenty.min_roznica_czasu, argumenty.min_roznica_pamieci)
+        if regresje:
+            print("Wykryto regresje względem wyników bazowych:")
+            for regresja in regresje:
+                print(f"  {regresja}")
+            return 1
+        print("Brak regresji względem wyników bazowych.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -9,6 +9,10 @@
 # program potrafi również narysować wykres słupkowy tych statystyk.
 # W losowym miejscu sekwencji (w wersji zapisywanej do pliku) wstawiane jest podane przez użytkownika imię,
 # które nie wpływa na obliczane statystyki DNA.
+# Od wersji z ulepszeniem 5 sekwencja jest losowana całymi blokami (numpy), powtarzalnie na podstawie ziarna,
+# z opcjonalnie zadanym składem nukleotydów lub zawartością GC.
+# Od wersji z ulepszeniem 8 program można uruchomić wsadowo (argumenty linii poleceń, np. --manifest lub --liczba),
+# aby równolegle wygenerować wiele rekordów FASTA wraz z łączną tabelą statystyk.
 
 # Kontekst jego zastosowania:
 # Narzędzie to może być przydatne dla bioinformatyków, biologów molekularnych, studentów kierunków
@@ -19,8 +23,23 @@
 # - Wizualizacji składu nukleotydowego.
 # - Ćwiczenia w programowaniu i przetwarzaniu danych tekstowych.
 
+import time  # Import modułu time do pomiaru czasu importu i działania programu (dla ulepszenia 11)
+
+_POCZATEK_IMPORTU = time.perf_counter()  # Chwila rozpoczęcia importu modułu (ULEPSZENIE 11)
+
+import argparse  # Import modułu argparse do obsługi trybu wsadowego z linii poleceń (dla ulepszenia 8)
+import csv  # Import modułu csv do czytania manifestu i zapisu tabeli statystyk (dla ulepszenia 8)
+import os  # Import modułu os do operacji na plikach i liczby rdzeni procesora (dla ulepszenia 8)
 import random  # Import modułu random do generowania liczb losowych i losowych wyborów
 import re  # Import modułu re do pracy z wyrażeniami regularnymi (dla ulepszenia 1)
+import gzip  # Import modułu gzip do zapisu skompresowanych plików FASTA (dla ulepszenia 7)
+import struct  # Import modułu struct do budowy nagłówków bloków BGZF i indeksu .gzi (dla ulepszenia 7)
+import zlib  # Import modułu zlib do kompresji bloków BGZF (dla ulepszenia 7)
+import shutil  # Import modułu shutil do łączenia i usuwania plików częściowych (dla ulepszenia 8)
+import sys  # Import modułu sys do odczytu argumentów programu (dla ulepszenia 8)
+import tempfile  # Import modułu tempfile do katalogu plików częściowych (dla ulepszenia 8)
+from concurrent.futures import ProcessPoolExecutor  # Pula procesów do równoległego generowania rekordów (ulepszenie 8)
+import importlib.util  # Import modułu importlib.util do sprawdzenia dostępności bibliotek bez ich importu (ulepszenie 11)
 
 # ULEPSZENIE 4: Dodanie wizualizacji statystyk za pomocą matplotlib
 # ORIGINAL:
@@ -29,20 +48,734 @@ import re  # Import modułu re do pracy z wyrażeniami regularnymi (dla ulepszen
 # Wizualizacja danych często ułatwia ich zrozumienie. Wykres słupkowy jest dobrym sposobem
 # na przedstawienie procentowego udziału poszczególnych nukleotydów.
 # Dodano obsługę braku biblioteki matplotlib.
-MATPLOTLIB_AVAILABLE = False  # Flaga informująca, czy biblioteka matplotlib jest dostępna
+# ULEPSZENIE 11: Leniwy import matplotlib
+# ORIGINAL:
+# try:
+#     import matplotlib.pyplot as plt
+#     MATPLOTLIB_AVAILABLE = True
+# except ImportError: ...
+# MODIFIED (Sprawdzenie dostępności biblioteki bez jej importu; pyplot importowany dopiero przy rysowaniu):
+# Import matplotlib.pyplot trwa długo nawet wtedy, gdy żaden wykres nie jest rysowany, co przy tysiącach
+# uruchomień z systemu kolejkowego zadań sumuje się do godzin.
+MATPLOTLIB_AVAILABLE = importlib.util.find_spec("matplotlib") is not None  # Flaga dostępności (bez importu)
+if not MATPLOTLIB_AVAILABLE:  # Obsługa braku biblioteki
+    print("Biblioteka matplotlib nie jest zainstalowana. Wykresy nie będą generowane.")  # Informacja dla użytkownika
+    print("Aby zainstalować, użyj: pip install matplotlib")
+plt = None  # Moduł matplotlib.pyplot - importowany przy pierwszym użyciu przez _pyplot()
+
+
+def _pyplot():
+    """Zwraca moduł matplotlib.pyplot, importując go przy pierwszym wywołaniu."""
+    global plt
+    if plt is None:
+        import matplotlib.pyplot as modul_pyplot  # Kosztowny import wykonywany tylko, gdy rysujemy interaktywnie
+        plt = modul_pyplot
+    return plt
+
+
+# ULEPSZENIE 5: Szybki, powtarzalny generator sekwencji oparty na numpy
+# ORIGINAL:
+# (brak tej funkcjonalności - sekwencja była losowana zasada po zasadzie przez random.choice)
+# MODIFIED (Dodanie opcjonalnego użycia biblioteki numpy do losowania całych bloków zasad naraz):
+# Jedno wywołanie Pythona na każdą zasadę sprawia, że genomy testowe rzędu 10^8-10^9 bp powstają minutami.
+# Numpy losuje cały blok jednym wywołaniem. Dodano obsługę braku biblioteki numpy (wolniejszy generator zapasowy).
+NUMPY_AVAILABLE = False  # Flaga informująca, czy biblioteka numpy jest dostępna
 try:
-    import matplotlib.pyplot as plt  # Próba importu biblioteki matplotlib
+    import numpy as np  # Próba importu biblioteki numpy
 
-    MATPLOTLIB_AVAILABLE = True  # Ustawienie flagi na True, jeśli import się powiódł
+    NUMPY_AVAILABLE = True  # Ustawienie flagi na True, jeśli import się powiódł
 except ImportError:  # Obsługa błędu, jeśli biblioteka nie jest zainstalowana
-    print("Biblioteka matplotlib nie jest zainstalowana. Wykresy nie będą generowane.")  # Informacja dla użytkownika
-    print("Aby zainstalować, użyj: pip install matplotlib")
+    print("Biblioteka numpy nie jest zainstalowana. Używany będzie wolniejszy generator sekwencji.")  # Informacja dla użytkownika
+    print("Aby zainstalować, użyj: pip install numpy")
+
+NUKLEOTYDY = "ACGT"  # Alfabet nukleotydów w ustalonej kolejności (indeks = kod nukleotydu 0-3)
+ROZMIAR_BLOKU_GENERATORA = 1 << 20  # Liczba zasad losowanych jednym wywołaniem (stała, aby wynik zależał tylko od ziarna)
+ROZMIAR_BLOKU_STATYSTYK = 1 << 22  # Liczba znaków kodowanych i zliczanych naraz przez silnik statystyk (ULEPSZENIE 6)
+KOD_NIEPOPRAWNY = 4  # Kod znaku spoza alfabetu ACGT (np. N, małe litery, wstawione imię)
+MAKS_K = 31  # Największe k silnika statystyk - indeks k-meru (2 bity na zasadę) musi zmieścić się w int64
+MAKS_K_GESTE = 11  # Do tego k liczniki są gęstą tablicą 4**k (32 MiB przy k=11), powyżej - rzadkie (ULEPSZENIE 6)
+ROZMIAR_BUFORA_ZAPISU = 1 << 22  # Rozmiar bufora pliku FASTA - zapis dużymi porcjami zamiast linia po linii (ULEPSZENIE 7)
+POZIOM_KOMPRESJI = 6  # Domyślny poziom gzip/BGZF (9 jest kilkukrotnie wolniejszy przy niewiele mniejszym pliku)
+BGZF_MAKS_BLOK = 0xff00  # Maksymalna liczba nieskompresowanych bajtów w jednym bloku BGZF (jak w htslib)
+BGZF_EOF = bytes.fromhex("1f8b08040000000000ff0600424302001b0003000000000000000000")  # Pusty blok kończący plik BGZF
+if NUMPY_AVAILABLE:
+    _LITERY_NUKLEOTYDOW = np.frombuffer(NUKLEOTYDY.encode("ascii"), dtype=np.uint8)  # Tablica kod -> bajt ASCII litery
+    _KODY_BAJTOW = np.full(256, KOD_NIEPOPRAWNY, dtype=np.uint8)  # Tablica bajt ASCII -> kod nukleotydu
+    _KODY_BAJTOW[_LITERY_NUKLEOTYDOW] = np.arange(4, dtype=np.uint8)  # Tylko wielkie litery A, C, G, T mają kody 0-3
+    _PRZESUNIECIA_2BIT = np.array([6, 4, 2, 0], dtype=np.uint8)  # Położenie kolejnych 4 zasad w bajcie (ULEPSZENIE 9)
+
+
+# --- Funkcje pomocnicze generatora (ULEPSZENIE 5) ---
+
+def _prawdopodobienstwa_skladu(sklad: dict = None, zawartosc_gc: float = None) -> list:
+    """Zamienia docelowy skład nukleotydów lub zawartość GC (w %) na prawdopodobieństwa dla A, C, G, T."""
+    if sklad is not None and zawartosc_gc is not None:  # Oba parametry naraz byłyby sprzeczne
+        raise ValueError("Podaj albo skład nukleotydów, albo zawartość GC, nie oba naraz.")
+    if zawartosc_gc is not None:  # Zawartość GC podana w procentach, tak jak CG_stosunek w statystykach
+        if not 0 <= zawartosc_gc <= 100:  # Sprawdzenie zakresu procentowego
+            raise ValueError("Zawartość GC musi mieścić się w przedziale 0-100%.")
+        p_gc = zawartosc_gc / 200  # Prawdopodobieństwo każdej z zasad C i G
+        p_at = (100 - zawartosc_gc) / 200  # Prawdopodobieństwo każdej z zasad A i T
+        return [p_at, p_gc, p_gc, p_at]  # Kolejność zgodna z NUKLEOTYDY
+    if sklad is None:  # Brak wymagań co do składu
+        return [0.25, 0.25, 0.25, 0.25]  # Rozkład równomierny, jak w oryginalnym random.choice("ACGT")
+    nieznane = set(sklad) - set(NUKLEOTYDY)  # Klucze spoza alfabetu ACGT
+    if nieznane:
+        raise ValueError(f"Nieznane nukleotydy w składzie: {', '.join(sorted(nieznane))}.")
+    wagi = [float(sklad.get(nukleotyd, 0)) for nukleotyd in NUKLEOTYDY]  # Wagi w kolejności A, C, G, T
+    if any(waga < 0 for waga in wagi) or sum(wagi) <= 0:  # Wagi muszą tworzyć poprawny rozkład
+        raise ValueError("Wagi składu muszą być nieujemne i nie mogą sumować się do zera.")
+    suma_wag = sum(wagi)
+    return [waga / suma_wag for waga in wagi]  # Normalizacja wag do prawdopodobieństw
+
+
+def _ustal_ziarno(ziarno: int = None) -> int:
+    """Zwraca ziarno generatora; bez jawnego ziarna losuje je z modułu random (respektuje random.seed)."""
+    if ziarno is None:  # Brak jawnego ziarna
+        return random.getrandbits(64)  # Dzięki temu random.seed(...) nadal czyni wynik powtarzalnym
+    return ziarno
+
+
+def _bloki_kodow_dna(dlugosc: int, ziarno: int, prawdopodobienstwa: list):
+    """Generuje sekwencję jako kolejne bloki kodów 0-3 (numpy.uint8) o stałym rozmiarze ROZMIAR_BLOKU_GENERATORA."""
+    rng = np.random.default_rng(ziarno)  # Niezależny, powtarzalny generator numpy
+    rownomierny = prawdopodobienstwa == [0.25, 0.25, 0.25, 0.25]  # Szybka ścieżka dla rozkładu równomiernego
+    progi = np.cumsum(prawdopodobienstwa)  # Dystrybuanta rozkładu dla losowania z zadanym składem
+    progi[-1] = 1.0  # Zabezpieczenie przed błędem zaokrągleń na końcu dystrybuanty
+    for start in range(0, dlugosc, ROZMIAR_BLOKU_GENERATORA):  # Pętla po blokach stałego rozmiaru
+        rozmiar = min(ROZMIAR_BLOKU_GENERATORA, dlugosc - start)  # Ostatni blok może być krótszy
+        if rownomierny:
+            yield rng.integers(0, 4, size=rozmiar, dtype=np.uint8)  # Cały blok kodów jednym wywołaniem
+        else:
+            yield np.searchsorted(progi, rng.random(rozmiar), side="right").astype(np.uint8)  # Losowanie wg składu
+
+
+def _bloki_tekstu_dna(dlugosc: int, ziarno: int, prawdopodobienstwa: list):
+    """Generuje sekwencję jako kolejne bloki tekstu (str) o stałym rozmiarze ROZMIAR_BLOKU_GENERATORA."""
+    if NUMPY_AVAILABLE:  # Ścieżka szybka: kody numpy zamieniane na litery jedną operacją indeksowania
+        for kody in _bloki_kodow_dna(dlugosc, ziarno, prawdopodobienstwa):
+            yield _LITERY_NUKLEOTYDOW[kody].tobytes().decode("ascii")
+        return
+    generator = random.Random(ziarno)  # Ścieżka zapasowa bez numpy: własny, powtarzalny generator random
+    for start in range(0, dlugosc, ROZMIAR_BLOKU_GENERATORA):
+        rozmiar = min(ROZMIAR_BLOKU_GENERATORA, dlugosc - start)
+        yield "".join(generator.choices(NUKLEOTYDY, weights=prawdopodobienstwa, k=rozmiar))  # Cały blok naraz
+
+
+def _podziel_na_fragmenty(bloki, rozmiar_fragmentu: int):
+    """Przekształca strumień tekstów dowolnej długości w fragmenty o stałym rozmiarze (ostatni może być krótszy)."""
+    czesci = []  # Bufor zgromadzonych, jeszcze niewydanych tekstów
+    zgromadzone = 0  # Łączna długość tekstów w buforze
+    for blok in bloki:
+        czesci.append(blok)
+        zgromadzone += len(blok)
+        if zgromadzone >= rozmiar_fragmentu:  # W buforze jest co najmniej jeden pełny fragment
+            calosc = "".join(czesci)
+            koniec = zgromadzone - zgromadzone % rozmiar_fragmentu  # Koniec ostatniego pełnego fragmentu
+            for start in range(0, koniec, rozmiar_fragmentu):
+                yield calosc[start:start + rozmiar_fragmentu]
+            reszta = calosc[koniec:]  # Niepełna końcówka czeka na kolejne bloki
+            czesci = [reszta] if reszta else []
+            zgromadzone = len(reszta)
+    if zgromadzone:  # Ostatni, niepełny fragment
+        yield "".join(czesci)
+
+
+def generuj_fragmenty_dna(dlugosc: int, ziarno: int = None, sklad: dict = None, zawartosc_gc: float = None,
+                          rozmiar_fragmentu: int = ROZMIAR_BLOKU_GENERATORA):
+    """Generuje losową sekwencję DNA jako iterator fragmentów (str) o stałym rozmiarze.
+
+    Wynik zależy wyłącznie od ziarna i składu, a nie od rozmiaru fragmentu. Skład można podać jako
+    słownik wag (np. {'A': 1, 'C': 2, 'G': 2, 'T': 1}) albo jako docelową zawartość GC w procentach.
+    """
+    if dlugosc < 0:  # Sprawdzenie, czy podana długość nie jest ujemna
+        raise ValueError("Długość sekwencji nie może być ujemna.")
+    if rozmiar_fragmentu <= 0:  # Fragmenty muszą mieć dodatni rozmiar
+        raise ValueError("Rozmiar fragmentu musi być dodatni.")
+    prawdopodobienstwa = _prawdopodobienstwa_skladu(sklad, zawartosc_gc)  # Walidacja składu przed losowaniem
+    bloki = _bloki_tekstu_dna(dlugosc, _ustal_ziarno(ziarno), prawdopodobienstwa)
+    if rozmiar_fragmentu == ROZMIAR_BLOKU_GENERATORA:  # Bloki generatora mają już żądany rozmiar
+        return bloki
+    return _podziel_na_fragmenty(bloki, rozmiar_fragmentu)
+
+
+# ULEPSZENIE 6: Jednoprzebiegowy, scalalny silnik statystyk k-merów
+# ORIGINAL:
+# (oblicz_statystyki przechodziła sekwencję dwa razy w Pythonie: raz dla mononukleotydów, raz dla dinukleotydów)
+# MODIFIED (Dodanie silnika zliczającego k-mery dowolnej długości na sekwencji zakodowanej jako liczby 0-3):
+# Zliczanie odbywa się wektorowo (np.bincount), a częściowe wyniki dla kolejnych fragmentów można scalać,
+# więc skanowanie strumieniowe lub równoległe daje dokładnie te same liczniki co jedno wywołanie w pamięci.
+# Dla k > MAKS_K_GESTE tablica 4**k liczników byłaby zbyt duża (k=14 to ponad 2 GiB), więc liczniki są
+# rzadkie: posortowane indeksy występujących k-merów i ich liczby. Największe obsługiwane k to MAKS_K.
+
+def _wymagaj_numpy():
+    """Zgłasza czytelny błąd, jeśli funkcja wymaga biblioteki numpy, a ta nie jest dostępna."""
+    if not NUMPY_AVAILABLE:
+        raise ImportError("Ta funkcja wymaga biblioteki numpy. Aby zainstalować, użyj: pip install numpy")
+
+
+def _koduj_fragment(fragment):
+    """Zamienia fragment sekwencji (str, bytes lub tablicę kodów numpy) na tablicę kodów 0-4 (numpy.uint8)."""
+    if isinstance(fragment, np.ndarray):  # Tablica numpy jest traktowana jako gotowe kody
+        return fragment.astype(np.uint8, copy=False)
+    if isinstance(fragment, str):  # Każdy znak spoza latin-1 zamieniany na '?', aby zachować długość
+        fragment = fragment.encode("latin-1", "replace")
+    return _KODY_BAJTOW[np.frombuffer(fragment, dtype=np.uint8)]  # Jedna operacja indeksowania dla całego fragmentu
+
+
+def _kolejne_indeksy_kmerow(kody, k_max: int):
+    """Zwraca kolejno pary (k, indeksy) dla k = 1..k_max: indeksy (system czwórkowy) wszystkich k-merów
+    złożonych wyłącznie z A, C, G, T, w kolejności wystąpienia.
+
+    Indeksy k-merów powstają z indeksów (k-1)-merów przez dopisanie jednej cyfry, a maska okien bez znaków
+    spoza ACGT - z maski dla k-1, więc każde kolejne k kosztuje jedną operację na tablicy, a nie k.
+    """
+    cyfry = (kody & 3).astype(np.int64)  # Kod nukleotydu jako cyfra czwórkowa
+    poprawne_znaki = kody < KOD_NIEPOPRAWNY
+    sa_niepoprawne = not poprawne_znaki.all()
+    indeksy, poprawne = cyfry, poprawne_znaki
+    for k in range(1, k_max + 1):
+        if k > 1:  # Dopisanie k-tej zasady do każdego okna (k-1)-meru, który ma następnika
+            indeksy = (indeksy[:-1] << 2) | cyfry[k - 1:]
+            if sa_niepoprawne:
+                poprawne = poprawne[:-1] & poprawne_znaki[k - 1:]
+        yield k, indeksy[poprawne] if sa_niepoprawne else indeksy
+
+
+def _indeksy_kmerow(kody, k: int):
+    """Zwraca indeksy wszystkich k-merów złożonych wyłącznie z A, C, G, T (dla jednego k)."""
+    for _, indeksy in _kolejne_indeksy_kmerow(kody, k):
+        pass
+    return indeksy
+
+
+class _LicznikRzadki:
+    """Rzadkie liczniki k-merów: posortowane indeksy występujących k-merów i ich liczby.
+
+    Nowe indeksy są buforowane i scalane (sortowanie + np.add.reduceat) dopiero, gdy bufor urośnie
+    do rozmiaru zebranych już liczników lub przy odczycie, więc koszt scalania rozkłada się na wiele aktualizacji.
+    """
+    __slots__ = ("_klucze", "_liczby", "_oczekujace", "_liczba_oczekujacych")
+
+    def __init__(self):
+        self._klucze = np.zeros(0, dtype=np.int64)
+        self._liczby = np.zeros(0, dtype=np.int64)
+        self._oczekujace = []  # Pary (indeksy, liczby lub None = po jednym) czekające na scalenie
+        self._liczba_oczekujacych = 0
+
+    def dodaj(self, indeksy, liczby=None):
+        """Dolicza podane indeksy k-merów (każdy raz albo z podanymi liczbami)."""
+        if len(indeksy) == 0:
+            return
+        self._oczekujace.append((indeksy, liczby))
+        self._liczba_oczekujacych += len(indeksy)
+        if self._liczba_oczekujacych >= max(len(self._klucze), ROZMIAR_BLOKU_STATYSTYK):
+            self._scal()
+
+    def _scal(self):
+        if not self._oczekujace:
+            return
+        klucze = np.concatenate([self._klucze] + [indeksy for indeksy, _ in self._oczekujace])
+        liczby = np.concatenate([self._liczby] + [np.ones(len(indeksy), dtype=np.int64) if liczby is None else liczby
+                                                  for indeksy, liczby in self._oczekujace])
+        self._oczekujace, self._liczba_oczekujacych = [], 0
+        kolejnosc = np.argsort(klucze, kind="stable")
+        klucze, liczby = klucze[kolejnosc], liczby[kolejnosc]
+        poczatki = np.flatnonzero(np.concatenate(([True], klucze[1:] != klucze[:-1])))  # Początki grup równych kluczy
+        self._klucze, self._liczby = klucze[poczatki], np.add.reduceat(liczby, poczatki)
+
+    def pary(self) -> tuple:
+        """Zwraca (posortowane indeksy, liczby) wszystkich zliczonych k-merów."""
+        self._scal()
+        return self._klucze, self._liczby
+
+    def __iadd__(self, inny: "_LicznikRzadki") -> "_LicznikRzadki":
+        self.dodaj(*inny.pary())
+        return self
+
+
+def _nowy_licznik(k: int):
+    """Tworzy pusty licznik k-merów: gęstą tablicę 4**k dla k <= MAKS_K_GESTE, w przeciwnym razie rzadki."""
+    return np.zeros(4 ** k, dtype=np.int64) if k <= MAKS_K_GESTE else _LicznikRzadki()
+
+
+def _scal_liczniki(cel, zrodlo):
+    """Dolicza licznik zrodlo do licznika cel (gęstego lub rzadkiego) i zwraca wynik (cel lub nowy gęsty licznik)."""
+    if isinstance(zrodlo, _LicznikRzadki):
+        if isinstance(cel, _LicznikRzadki):
+            cel += zrodlo
+        else:
+            indeksy, liczby = zrodlo.pary()
+            np.add.at(cel, indeksy, liczby)
+        return cel
+    if isinstance(cel, _LicznikRzadki):  # Rzadki licznik małego fragmentu przechodzi na gęstą tablicę źródła
+        return _scal_liczniki(zrodlo.copy(), cel)
+    cel += zrodlo
+    return cel
+
+
+def _dodaj_indeksy(licznik, indeksy):
+    """Dolicza (w miejscu) k-mery o podanych indeksach do licznika gęstego lub rzadkiego.
+
+    Przy niewielu oknach względem 4**k gęste liczniki aktualizowane są punktowo (np.add.at), aby krótki
+    fragment nie kosztował alokacji i przejścia po całej tablicy, jak w np.bincount(minlength=4**k).
+    """
+    if isinstance(licznik, _LicznikRzadki):
+        licznik.dodaj(indeksy)
+    elif len(indeksy) * 8 < len(licznik):  # Rzadka aktualizacja
+        np.add.at(licznik, indeksy, 1)
+    else:
+        licznik += np.bincount(indeksy, minlength=len(licznik))
+
+
+class StatystykiKmerow:
+    """Scalalne liczniki k-merów (k = 1..k_max) dla sekwencji przetwarzanej w całości lub fragmentami.
+
+    Oprócz liczników przechowywane są pierwsze i ostatnie k_max-1 kody, dzięki czemu przy scalaniu
+    sąsiednich fragmentów doliczane są k-mery przechodzące przez granicę fragmentów. k_max może wynosić
+    najwyżej MAKS_K; liczniki dla k > MAKS_K_GESTE są rzadkie (pamięć rośnie z liczbą różnych k-merów, nie z 4**k).
+    """
+    __slots__ = ("k_max", "dlugosc", "liczniki", "glowa", "ogon")
+
+    def __init__(self, k_max: int = 2, rzadkie_od: int = None):
+        _wymagaj_numpy()
+        if not 1 <= k_max <= MAKS_K:  # Co najmniej mononukleotydy, indeks k-meru w int64
+            raise ValueError(f"k_max musi mieścić się w przedziale 1-{MAKS_K}.")
+        self.k_max = k_max  # Największa długość zliczanych k-merów
+        self.dlugosc = 0  # Liczba wszystkich znaków (również spoza ACGT), jak len() w oryginalnej funkcji
+        self.liczniki = [_nowy_licznik(k) if rzadkie_od is None or k < max(rzadkie_od, 2) else _LicznikRzadki()
+                         for k in range(1, k_max + 1)]  # liczniki[k-1] dla k-merów (rzadkie od k = rzadkie_od)
+        self.glowa = np.zeros(0, dtype=np.uint8)  # Pierwsze (co najwyżej k_max-1) kody
+        self.ogon = np.zeros(0, dtype=np.uint8)  # Ostatnie (co najwyżej k_max-1) kody
+
+    @classmethod
+    def z_fragmentu(cls, fragment, k_max: int = 2):
+        """Tworzy częściowe statystyki dla jednego fragmentu (do późniejszego scalenia z sąsiadami).
+
+        Dla k, przy których fragment ma znacznie mniej okien niż 4**k, liczniki są rzadkie - krótkie
+        fragmenty nie alokują pełnych tablic 4**k.
+        """
+        kody = _koduj_fragment(fragment)
+        wynik = cls(k_max, rzadkie_od=next((k for k in range(2, k_max + 1) if 4 ** k > 8 * len(kody)), None))
+        return wynik._dolacz_kody(kody)
+
+    def _dodaj_kmery_graniczne(self, glowa_prawego):
+        """Dolicza k-mery zaczynające się w ogonie bieżących statystyk i kończące w podanej głowie prawego sąsiada."""
+        okno = np.concatenate((self.ogon, glowa_prawego))  # Jedyne miejsce, gdzie mogą leżeć k-mery przez granicę
+        granica = len(self.ogon)
+        for k in range(2, self.k_max + 1):  # Co najwyżej k-1 k-merów na granicę - aktualizacja punktowa
+            start = max(0, granica - k + 1)
+            _dodaj_indeksy(self.liczniki[k - 1], _indeksy_kmerow(okno[start:granica + k - 1], k))
+
+    def _przesun_brzegi(self, glowa_prawego, ogon_prawego, dlugosc_prawego: int):
+        """Aktualizuje zapamiętaną głowę, ogon i długość po dołączeniu fragmentu z prawej strony."""
+        brzeg = self.k_max - 1
+        if self.dlugosc < brzeg:  # Krótki lewy fragment: głowa uzupełniana z prawego
+            self.glowa = np.concatenate((self.glowa, glowa_prawego))[:brzeg]
+        self.ogon = np.concatenate((self.ogon, ogon_prawego))[-brzeg:] if brzeg else self.ogon
+        self.dlugosc += dlugosc_prawego
+
+    def _dolacz_kody(self, kody) -> "StatystykiKmerow":
+        """Dolicza kody kolejnego fragmentu bezpośrednio do bieżących liczników (bez tworzenia statystyk częściowych)."""
+        if len(kody) == 0:  # Pusty fragment niczego nie zmienia
+            return self
+        brzeg = min(len(kody), self.k_max - 1)  # Długość głowy i ogona fragmentu
+        glowa = kody[:brzeg].copy()
+        ogon = kody[len(kody) - brzeg:].copy()
+        self._dodaj_kmery_graniczne(glowa)
+        for k, indeksy in _kolejne_indeksy_kmerow(kody, self.k_max):
+            _dodaj_indeksy(self.liczniki[k - 1], indeksy)
+        self._przesun_brzegi(glowa, ogon, len(kody))
+        return self
+
+    def scal(self, prawy: "StatystykiKmerow") -> "StatystykiKmerow":
+        """Dołącza (w miejscu) statystyki fragmentu leżącego bezpośrednio za bieżącym i zwraca self."""
+        if prawy.k_max != self.k_max:
+            raise ValueError("Można scalać tylko statystyki o tym samym k_max.")
+        if prawy.dlugosc == 0:  # Pusty fragment niczego nie zmienia
+            return self
+        self._dodaj_kmery_graniczne(prawy.glowa)
+        for k in range(self.k_max):
+            self.liczniki[k] = _scal_liczniki(self.liczniki[k], prawy.liczniki[k])
+        self._przesun_brzegi(prawy.glowa, prawy.ogon, prawy.dlugosc)
+        return self
+
+    def aktualizuj(self, fragment) -> "StatystykiKmerow":
+        """Dolicza kolejny fragment sekwencji (przetwarzany blokami ROZMIAR_BLOKU_STATYSTYK) i zwraca self."""
+        if isinstance(fragment, SekwencjaDNA2bit):  # Sekwencja spakowana: kody bez materializacji tekstu
+            bloki = fragment.fragmenty_kodow(ROZMIAR_BLOKU_STATYSTYK)
+        else:  # Ograniczenie pamięci tablic pomocniczych - przetwarzanie blokami
+            bloki = (fragment[start:start + ROZMIAR_BLOKU_STATYSTYK]
+                     for start in range(0, len(fragment), ROZMIAR_BLOKU_STATYSTYK))
+        for blok in bloki:  # Każdy blok doliczany wprost do bieżących liczników
+            self._dolacz_kody(_koduj_fragment(blok))
+        return self
+
+    def kmery(self, k: int) -> dict:
+        """Zwraca słownik {k-mer: liczba} dla k-merów, które wystąpiły co najmniej raz."""
+        if not 1 <= k <= self.k_max:
+            raise ValueError(f"k musi mieścić się w przedziale 1-{self.k_max}.")
+        licznik = self.liczniki[k - 1]
+        if isinstance(licznik, _LicznikRzadki):
+            indeksy, liczby = licznik.pary()
+        else:  # Tylko niezerowe liczniki, jak w oryginalnym słowniku dinukleotydów
+            indeksy = np.flatnonzero(licznik)
+            liczby = licznik[indeksy]
+        wynik = {}
+        for indeks, liczba in zip(indeksy.tolist(), liczby.tolist()):
+            kmer = "".join(NUKLEOTYDY[(indeks >> (2 * (k - 1 - pozycja))) & 3] for pozycja in range(k))
+            wynik[kmer] = liczba
+        return wynik
+
+    def do_slownika(self) -> dict:
+        """Zwraca statystyki w formacie zgodnym z oblicz_statystyki (A_proc, A_count, CG_stosunek, dinukleotydy...)."""
+        liczby = {nukleotyd: int(self.liczniki[0][kod]) for kod, nukleotyd in enumerate(NUKLEOTYDY)}
+        if self.dlugosc == 0:  # Pusta sekwencja: zerowe wartości, jak w oryginalnej funkcji
+            wynik = {f'{nukleotyd}_proc': 0.0 for nukleotyd in NUKLEOTYDY}
+        else:
+            wynik = {f'{nukleotyd}_proc': (liczby[nukleotyd] / self.dlugosc) * 100 for nukleotyd in NUKLEOTYDY}
+        wynik.update({f'{nukleotyd}_count': liczby[nukleotyd] for nukleotyd in NUKLEOTYDY})
+        wynik['CG_stosunek'] = ((liczby['C'] + liczby['G']) / self.dlugosc) * 100 if self.dlugosc else 0.0
+        wynik['dinukleotydy'] = self.kmery(2) if self.k_max >= 2 else {}
+        return wynik
+
+
+def oblicz_statystyki_fragmentow(fragmenty, k_max: int = 2) -> StatystykiKmerow:
+    """Oblicza statystyki k-merów dla sekwencji podanej jako iterator kolejnych fragmentów."""
+    statystyki = StatystykiKmerow(k_max)
+    for fragment in fragmenty:  # Kolejne fragmenty scalane są z uwzględnieniem k-merów na granicach
+        statystyki.aktualizuj(fragment)
+    return statystyki
+
+
+# ULEPSZENIE 7: Strumieniowy, buforowany zapis FASTA z kompresją i indeksem .fai
+# ORIGINAL:
+# (zapisz_do_fasta wymagała całej sekwencji w pamięci i wykonywała osobny plik.write dla każdej linii)
+# MODIFIED (Dodanie zapisywacza przyjmującego iterator fragmentów i zapisującego duże, zawinięte bloki):
+# Zapis może być skompresowany (gzip lub BGZF), a obok pliku powstaje indeks .fai zgodny z samtools,
+# dzięki czemu narzędzia zewnętrzne mają swobodny dostęp do wygenerowanych sekwencji bez ich ponownego czytania.
+
+class _PlikBGZF:
+    """Minimalny zapis pliku BGZF (ciąg bloków gzip do 64 KiB) z zapamiętaniem granic bloków dla indeksu .gzi."""
+
+    def __init__(self, nazwa_pliku: str, poziom_kompresji: int = POZIOM_KOMPRESJI):
+        self._plik = open(nazwa_pliku, 'wb')  # Plik docelowy w trybie binarnym
+        self._poziom_kompresji = poziom_kompresji
+        self._bufor = bytearray()  # Dane oczekujące na skompletowanie bloku
+        self._przesuniecie_skompresowane = 0  # Pozycja początku następnego bloku w pliku
+        self._przesuniecie_nieskompresowane = 0  # Pozycja początku następnego bloku w danych nieskompresowanych
+        self.granice_blokow = []  # Pary (przesunięcie skompresowane, nieskompresowane) bloków poza pierwszym
+
+    def write(self, dane: bytes):
+        """Dopisuje dane; pełne bloki są kompresowane i zapisywane od razu."""
+        self._bufor += dane
+        while len(self._bufor) >= BGZF_MAKS_BLOK:  # Zapis wszystkich pełnych bloków
+            self._zapisz_blok(bytes(self._bufor[:BGZF_MAKS_BLOK]))
+            del self._bufor[:BGZF_MAKS_BLOK]
+
+    def _zapisz_blok(self, dane: bytes):
+        """Kompresuje i zapisuje jeden blok BGZF."""
+        if self._przesuniecie_nieskompresowane:  # Pierwszy blok (0, 0) nie trafia do indeksu .gzi
+            self.granice_blokow.append((self._przesuniecie_skompresowane, self._przesuniecie_nieskompresowane))
+        kompresor = zlib.compressobj(self._poziom_kompresji, zlib.DEFLATED, -15)  # Surowy deflate, bez nagłówka zlib
+        skompresowane = kompresor.compress(dane) + kompresor.flush()
+        rozmiar_bloku = 18 + len(skompresowane) + 8  # Nagłówek z polem BC + dane + CRC32 i ISIZE
+        naglowek = struct.pack("<4BI2BH2BHH", 0x1f, 0x8b, 8, 4, 0, 0, 0xff, 6, 66, 67, 2, rozmiar_bloku - 1)
+        self._plik.write(naglowek + skompresowane + struct.pack("<II", zlib.crc32(dane), len(dane)))
+        self._przesuniecie_skompresowane += rozmiar_bloku
+        self._przesuniecie_nieskompresowane += len(dane)
+
+    def close(self):
+        """Zapisuje ostatni niepełny blok oraz znacznik końca pliku BGZF."""
+        if self._bufor:
+            self._zapisz_blok(bytes(self._bufor))
+            self._bufor.clear()
+        self._plik.write(BGZF_EOF)
+        self._plik.close()
+
+
+def _zawin_linie(dane: bytes, szerokosc_linii: int) -> bytes:
+    """Dzieli dane o długości będącej wielokrotnością szerokości linii na linie zakończone znakiem nowej linii."""
+    if NUMPY_AVAILABLE:  # Jedna operacja na macierzy (wiersze x szerokość) zamiast pętli po liniach
+        wiersze = len(dane) // szerokosc_linii
+        tablica = np.empty((wiersze, szerokosc_linii + 1), dtype=np.uint8)
+        tablica[:, :szerokosc_linii] = np.frombuffer(dane, dtype=np.uint8).reshape(wiersze, szerokosc_linii)
+        tablica[:, szerokosc_linii] = ord("\n")
+        return tablica.tobytes()
+    return b"".join(dane[i:i + szerokosc_linii] + b"\n" for i in range(0, len(dane), szerokosc_linii))
+
+
+class ZapisywaczFasta:
+    """Strumieniowy zapis jednego lub wielu rekordów FASTA do pliku (opcjonalnie gzip/BGZF i indeks .fai).
+
+    Sekwencja każdego rekordu może być podana jako str albo jako iterator fragmentów; zawijanie linii
+    przebiega przez granice fragmentów tak samo, jak dla jednej, całej sekwencji.
+    """
+
+    def __init__(self, nazwa_pliku: str, szerokosc_linii: int = 70, kompresja: str = None, indeks: bool = False,
+                 poziom_kompresji: int = POZIOM_KOMPRESJI):
+        if kompresja not in (None, "gzip", "bgzf"):  # Obsługiwane rodzaje kompresji
+            raise ValueError("Kompresja musi być jedną z wartości: None, 'gzip', 'bgzf'.")
+        if indeks and kompresja == "gzip":  # samtools nie indeksuje zwykłego gzip (brak swobodnego dostępu)
+            raise ValueError("Indeks .fai wymaga pliku nieskompresowanego lub skompresowanego w formacie BGZF.")
+        self.nazwa_pliku = nazwa_pliku
+        self.szerokosc_linii = szerokosc_linii
+        self.kompresja = kompresja
+        self.indeks = indeks
+        self.wpisy_fai = []  # Linie indeksu .fai dla zapisanych rekordów
+        self.pozycja = 0  # Liczba zapisanych (nieskompresowanych) bajtów - przesunięcia w indeksie .fai
+        if kompresja == "bgzf":
+            self._plik = _PlikBGZF(nazwa_pliku, poziom_kompresji)
+        elif kompresja == "gzip":  # Stały czas w nagłówku - powtarzalny wynik
+            self._plik = gzip.GzipFile(nazwa_pliku, 'wb', compresslevel=poziom_kompresji, mtime=0)
+        else:
+            self._plik = open(nazwa_pliku, 'wb', buffering=ROZMIAR_BUFORA_ZAPISU)  # Duży bufor zapisu
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, typ_wyjatku, wyjatek, slad):
+        self.zamknij()
+
+    def _zapisz(self, dane: bytes):
+        """Zapisuje dane do pliku i przesuwa licznik pozycji."""
+        self._plik.write(dane)
+        self.pozycja += len(dane)
+
+    def zapisz_rekord(self, id_sekwencji: str, opis: str, sekwencja) -> int:
+        """Zapisuje jeden rekord FASTA i zwraca liczbę znaków jego sekwencji."""
+        if isinstance(sekwencja, str):  # Pojedynczy string traktowany jak jeden fragment
+            sekwencja = (sekwencja,)
+        elif isinstance(sekwencja, SekwencjaDNA2bit):  # Sekwencja spakowana (ULEPSZENIE 9) rozpakowywana fragmentami
+            sekwencja = sekwencja.fragmenty()
+        self._zapisz(f">{id_sekwencji} {opis}\n".encode("utf-8"))  # Nagłówek w dotychczasowym formacie
+        przesuniecie = self.pozycja  # Pozycja pierwszej zasady rekordu
+        dlugosc = 0  # Liczba znaków sekwencji
+        tylko_ascii = True  # Indeks .fai jest poprawny tylko, gdy znak = bajt
+        if self.szerokosc_linii <= 0:  # Brak zawijania: cała sekwencja w jednej linii
+            for fragment in sekwencja:
+                dlugosc += len(fragment)
+                tylko_ascii = tylko_ascii and fragment.isascii()
+                self._zapisz(fragment.encode("utf-8"))
+            self._zapisz(b"\n")
+        else:
+            reszta = ""  # Niepełna linia przenoszona do następnego fragmentu
+            for fragment in sekwencja:
+                dlugosc += len(fragment)
+                tekst = reszta + fragment if reszta else fragment
+                pelne = len(tekst) - len(tekst) % self.szerokosc_linii  # Znaki tworzące pełne linie
+                if tekst.isascii():  # Szybka ścieżka: znak = bajt, zawijanie na całym bloku
+                    if pelne:
+                        self._zapisz(_zawin_linie(tekst[:pelne].encode("ascii"), self.szerokosc_linii))
+                else:  # Wolniejsza ścieżka dla znaków spoza ASCII (np. imię z polskimi znakami)
+                    tylko_ascii = False
+                    self._zapisz("".join(tekst[i:i + self.szerokosc_linii] + "\n"
+                                         for i in range(0, pelne, self.szerokosc_linii)).encode("utf-8"))
+                reszta = tekst[pelne:]
+            if reszta:  # Ostatnia, niepełna linia
+                tylko_ascii = tylko_ascii and reszta.isascii()
+                self._zapisz((reszta + "\n").encode("utf-8"))
+        if self.indeks:
+            self._dodaj_wpis_fai(id_sekwencji, dlugosc, przesuniecie, tylko_ascii)
+        return dlugosc
+
+    def _dodaj_wpis_fai(self, id_sekwencji: str, dlugosc: int, przesuniecie: int, tylko_ascii: bool):
+        """Dodaje wpis indeksu .fai (NAZWA, DŁUGOŚĆ, PRZESUNIĘCIE, ZASADY_W_LINII, BAJTY_W_LINII)."""
+        nazwa = id_sekwencji.split()[0] if id_sekwencji.split() else id_sekwencji  # samtools: nagłówek do 1. spacji
+        if not tylko_ascii:  # Linie o różnej liczbie bajtów - indeks byłby niepoprawny
+            print(f"Pominięto wpis indeksu .fai dla rekordu {nazwa} (znaki spoza ASCII w sekwencji).")
+            return
+        if self.szerokosc_linii <= 0:
+            zasady_w_linii = dlugosc
+        else:
+            zasady_w_linii = min(dlugosc, self.szerokosc_linii)
+        bajty_w_linii = zasady_w_linii + 1 if zasady_w_linii else 0
+        self.wpisy_fai.append(f"{nazwa}\t{dlugosc}\t{przesuniecie}\t{zasady_w_linii}\t{bajty_w_linii}\n")
+
+    def zamknij(self):
+        """Zamyka plik i zapisuje indeks .fai (oraz .gzi dla BGZF)."""
+        if self._plik is None:  # Plik już zamknięty
+            return
+        self._plik.close()
+        if self.indeks:
+            with open(f"{self.nazwa_pliku}.fai", 'w') as plik_fai:
+                plik_fai.writelines(self.wpisy_fai)
+            if self.kompresja == "bgzf":  # samtools faidx wymaga dla BGZF także indeksu bloków .gzi
+                granice = self._plik.granice_blokow
+                with open(f"{self.nazwa_pliku}.gzi", 'wb') as plik_gzi:
+                    plik_gzi.write(struct.pack("<Q", len(granice)))
+                    plik_gzi.write(b"".join(struct.pack("<QQ", *granica) for granica in granice))
+        self._plik = None
+
+
+# ULEPSZENIE 9: Zwarta, 2-bitowa reprezentacja sekwencji z wstawianiem imienia bez kopiowania
+# ORIGINAL:
+# (sekwencja przekazywana jako str - co najmniej 1 bajt na zasadę; wstaw_imie budowała nowy string)
+# MODIFIED (Dodanie klasy przechowującej 4 zasady w bajcie, z imieniem jako nakładką w zadanej pozycji):
+# Sekwencje wielogigazasadowe zajmują około jednej czwartej dotychczasowej pamięci, a wstawienie imienia
+# kosztuje O(1), bez chwilowego podwojenia zużycia pamięci.
+
+def _pakuj_kody(kody):
+    """Pakuje kody 0-3 po cztery w bajcie (pierwsza zasada w najstarszych bitach)."""
+    reszta = (-len(kody)) % 4  # Dopełnienie do wielokrotności 4
+    if reszta:
+        kody = np.concatenate((kody, np.zeros(reszta, dtype=np.uint8)))
+    czworki = kody.reshape(-1, 4)
+    return (czworki[:, 0] << 6) | (czworki[:, 1] << 4) | (czworki[:, 2] << 2) | czworki[:, 3]
+
+
+class SekwencjaDNA2bit:
+    """Sekwencja DNA przechowywana w 2 bitach na zasadę, z opcjonalnym imieniem wstawionym jako nakładka.
+
+    Imię nie jest wklejane do danych, tylko zapamiętywane wraz z pozycją. Długość, wycinki, iteracja
+    po fragmentach i str() widzą sekwencję tak, jakby imię było w nią wstawione.
+    """
+    __slots__ = ("_dane", "_dlugosc_dna", "_imie", "_pozycja_imienia")
+
+    def __init__(self, dane, dlugosc_dna: int, imie: str = "", pozycja_imienia: int = 0):
+        _wymagaj_numpy()
+        if len(dane) * 4 < dlugosc_dna:  # Tablica musi pomieścić wszystkie zasady
+            raise ValueError("Tablica danych jest za krótka dla podanej długości sekwencji.")
+        if not 0 <= pozycja_imienia <= dlugosc_dna:
+            raise ValueError("Pozycja wstawienia imienia wykracza poza sekwencję.")
+        self._dane = dane  # Spakowane zasady (numpy.uint8, 4 zasady w bajcie)
+        self._dlugosc_dna = dlugosc_dna  # Liczba zasad DNA (bez imienia)
+        self._imie = imie  # Nakładka - wstawione imię
+        self._pozycja_imienia = pozycja_imienia  # Pozycja (w zasadach DNA), przed którą wstawione jest imię
+
+    @classmethod
+    def z_kodow(cls, bloki_kodow, dlugosc: int) -> "SekwencjaDNA2bit":
+        """Tworzy sekwencję z kolejnych bloków kodów 0-3 (każdy blok poza ostatnim o długości podzielnej przez 4)."""
+        dane = np.zeros((dlugosc + 3) // 4, dtype=np.uint8)  # Jedna alokacja na całą sekwencję
+        pozycja = 0
+        for kody in bloki_kodow:
+            if pozycja % 4:  # Niewyrównany blok nie mieściłby się w całych bajtach
+                raise ValueError("Bloki kodów (poza ostatnim) muszą mieć długość podzielną przez 4.")
+            if pozycja + len(kody) > dlugosc:
+                raise ValueError("Bloki kodów są dłuższe niż podana długość sekwencji.")
+            if len(kody) and kody.max() >= KOD_NIEPOPRAWNY:  # 2 bity mieszczą tylko A, C, G, T
+                raise ValueError("Sekwencja 2-bitowa może zawierać tylko wielkie litery A, C, G, T.")
+            dane[pozycja // 4:(pozycja + len(kody) + 3) // 4] = _pakuj_kody(kody)
+            pozycja += len(kody)
+        if pozycja != dlugosc:
+            raise ValueError("Bloki kodów są krótsze niż podana długość sekwencji.")
+        return cls(dane, dlugosc)
+
+    @classmethod
+    def z_tekstu(cls, sekwencja: str) -> "SekwencjaDNA2bit":
+        """Pakuje sekwencję podaną jako str (tylko A, C, G, T)."""
+        bloki = (_koduj_fragment(sekwencja[start:start + ROZMIAR_BLOKU_GENERATORA])
+                 for start in range(0, len(sekwencja), ROZMIAR_BLOKU_GENERATORA))
+        return cls.z_kodow(bloki, len(sekwencja))
+
+    @classmethod
+    def generuj(cls, dlugosc: int, ziarno: int = None, sklad: dict = None,
+                zawartosc_gc: float = None) -> "SekwencjaDNA2bit":
+        """Generuje losową sekwencję od razu w postaci spakowanej (ta sama sekwencja co generuj_sekwencje_dna)."""
+        if dlugosc < 0:
+            raise ValueError("Długość sekwencji nie może być ujemna.")
+        prawdopodobienstwa = _prawdopodobienstwa_skladu(sklad, zawartosc_gc)
+        return cls.z_kodow(_bloki_kodow_dna(dlugosc, _ustal_ziarno(ziarno), prawdopodobienstwa), dlugosc)
+
+    @property
+    def dlugosc_dna(self) -> int:
+        """Liczba zasad DNA (bez wstawionego imienia)."""
+        return self._dlugosc_dna
+
+    @property
+    def imie(self) -> str:
+        """Wstawione imię (pusty string, jeśli brak)."""
+        return self._imie
+
+    @property
+    def pozycja_imienia(self) -> int:
+        """Pozycja, na której wstawione jest imię."""
+        return self._pozycja_imienia
+
+    @property
+    def rozmiar_w_bajtach(self) -> int:
+        """Rozmiar spakowanych danych w bajtach."""
+        return self._dane.nbytes
+
+    def wstaw_imie(self, imie: str, pozycja: int) -> "SekwencjaDNA2bit":
+        """Zwraca sekwencję z imieniem wstawionym w pozycji (O(1), dane są współdzielone, nie kopiowane)."""
+        if self._imie:  # Obsługiwana jest jedna nakładka
+            raise ValueError("Do tej sekwencji wstawiono już imię.")
+        return SekwencjaDNA2bit(self._dane, self._dlugosc_dna, imie, pozycja)
+
+    def __len__(self) -> int:
+        return self._dlugosc_dna + len(self._imie)
+
+    def kody_dna(self, start: int, stop: int):
+        """Zwraca kody 0-3 zasad DNA z zakresu [start, stop) (współrzędne bez imienia)."""
+        if start >= stop:
+            return np.zeros(0, dtype=np.uint8)
+        bajty = self._dane[start // 4:(stop + 3) // 4]
+        kody = ((bajty[:, None] >> _PRZESUNIECIA_2BIT) & 3).ravel()  # Rozpakowanie 4 zasad z każdego bajtu
+        return kody[start % 4:start % 4 + (stop - start)]
+
+    def _odcinki(self, start: int, stop: int):
+        """Dzieli zakres [start, stop) (współrzędne z imieniem) na odcinki (czy_dna, początek, koniec)."""
+        pozycja, dlugosc_imienia = self._pozycja_imienia, len(self._imie)
+        if start < min(stop, pozycja):  # DNA przed imieniem
+            yield True, start, min(stop, pozycja)
+        if dlugosc_imienia and start < pozycja + dlugosc_imienia and stop > pozycja:  # Fragment imienia
+            yield False, max(start, pozycja) - pozycja, min(stop, pozycja + dlugosc_imienia) - pozycja
+        if stop > pozycja + dlugosc_imienia:  # DNA za imieniem
+            yield True, max(start, pozycja + dlugosc_imienia) - dlugosc_imienia, stop - dlugosc_imienia
+
+    def _tekst_zakresu(self, start: int, stop: int) -> str:
+        """Materializuje zakres [start, stop) jako str."""
+        return "".join(_LITERY_NUKLEOTYDOW[self.kody_dna(a, b)].tobytes().decode("ascii") if czy_dna
+                       else self._imie[a:b] for czy_dna, a, b in self._odcinki(start, stop))
+
+    def _kody_zakresu(self, start: int, stop: int):
+        """Zwraca kody zakresu [start, stop); znaki imienia kodowane jak w silniku statystyk."""
+        czesci = [self.kody_dna(a, b) if czy_dna else _koduj_fragment(self._imie[a:b])
+                  for czy_dna, a, b in self._odcinki(start, stop)]
+        return np.concatenate(czesci) if len(czesci) != 1 else czesci[0]
+
+    def fragmenty(self, rozmiar_fragmentu: int = ROZMIAR_BLOKU_GENERATORA):
+        """Iteruje po sekwencji (z imieniem) fragmentami str o stałym rozmiarze."""
+        for start in range(0, len(self), rozmiar_fragmentu):
+            yield self._tekst_zakresu(start, min(start + rozmiar_fragmentu, len(self)))
+
+    def fragmenty_kodow(self, rozmiar_fragmentu: int = ROZMIAR_BLOKU_STATYSTYK):
+        """Iteruje po sekwencji (z imieniem) fragmentami kodów numpy - bez materializacji tekstu."""
+        for start in range(0, len(self), rozmiar_fragmentu):
+            yield self._kody_zakresu(start, min(start + rozmiar_fragmentu, len(self)))
+
+    def __getitem__(self, klucz):
+        """Zwraca znak lub wycinek sekwencji (z imieniem) jako str."""
+        if isinstance(klucz, slice):
+            start, stop, krok = klucz.indices(len(self))
+            if krok == 1:
+                return self._tekst_zakresu(start, max(start, stop))
+            indeksy = range(start, stop, krok)
+            if not indeksy:
+                return ""
+            najmniejszy = min(indeksy[0], indeksy[-1])
+            tekst = self._tekst_zakresu(najmniejszy, max(indeksy[0], indeksy[-1]) + 1)
+            return tekst[indeksy[0] - najmniejszy::krok]
+        if klucz < 0:  # Indeksy ujemne liczone od końca, jak w str
+            klucz += len(self)
+        if not 0 <= klucz < len(self):
+            raise IndexError("Indeks sekwencji poza zakresem.")
+        return self._tekst_zakresu(klucz, klucz + 1)
+
+    def __str__(self) -> str:
+        return "".join(self.fragmenty())
+
+    def __repr__(self) -> str:
+        return (f"SekwencjaDNA2bit(dlugosc_dna={self._dlugosc_dna}, imie={self._imie!r}, "
+                f"pozycja_imienia={self._pozycja_imienia})")
 
 
 # --- Funkcje oryginalne i zmodyfikowane ---
 
-def generuj_sekwencje_dna(dlugosc: int) -> str:  # Definicja funkcji generującej sekwencję DNA
-    """Generuje losową sekwencję DNA o podanej długości."""  # Docstring funkcji
+def generuj_sekwencje_dna(dlugosc: int, ziarno: int = None, sklad: dict = None,
+                          zawartosc_gc: float = None) -> str:  # Definicja funkcji generującej sekwencję DNA
+    """Generuje losową sekwencję DNA o podanej długości (opcjonalnie z ziarnem i zadanym składem)."""  # Docstring funkcji
     if dlugosc < 0:  # Sprawdzenie, czy podana długość nie jest ujemna
         raise ValueError("Długość sekwencji nie może być ujemna.")  # Podniesienie błędu, jeśli warunek jest spełniony
     # ORIGINAL:
@@ -52,12 +785,26 @@ def generuj_sekwencje_dna(dlugosc: int) -> str:  # Definicja funkcji generujące
     # ta modyfikacja czyni obsługę tego przypadku bardziej jawną i czytelną.
     if dlugosc == 0:  # Jeśli długość to 0
         return ""  # Zwróć pusty string
-    return "".join(random.choice("ACGT") for _ in range(
-        dlugosc))  # Generowanie sekwencji: pętla przez zadaną długość, w każdej iteracji losowy wybór z "ACGT" i połączenie w string
+    # ULEPSZENIE 5 (ciąg dalszy):
+    # ORIGINAL:
+    # return "".join(random.choice("ACGT") for _ in range(dlugosc))
+    # MODIFIED (Funkcja jest teraz cienką nakładką na blokowy generator generuj_fragmenty_dna):
+    # Istniejące wywołania działają bez zmian, ale korzystają z losowania całymi blokami.
+    return "".join(generuj_fragmenty_dna(dlugosc, ziarno, sklad,
+                                         zawartosc_gc))  # Połączenie wygenerowanych bloków w jeden string
 
 
-def oblicz_statystyki(sekwencja: str) -> dict:  # Definicja funkcji obliczającej statystyki sekwencji
-    """Oblicza statystyki dla podanej sekwencji DNA, w tym częstości dinukleotydów."""  # Docstring funkcji
+def oblicz_statystyki(sekwencja) -> dict:  # Definicja funkcji obliczającej statystyki sekwencji
+    """Oblicza statystyki dla podanej sekwencji DNA (str lub SekwencjaDNA2bit), w tym częstości dinukleotydów."""  # Docstring funkcji
+    # ULEPSZENIE 6 (ciąg dalszy):
+    # ORIGINAL:
+    # (zawsze dwa przebiegi w Pythonie - poniższy kod, zachowany jako ścieżka zapasowa bez numpy)
+    # MODIFIED (Użycie jednoprzebiegowego silnika StatystykiKmerow, gdy numpy jest dostępne):
+    # Klucze wyniku pozostają te same. Dinukleotydy zawierające znak spoza A, C, G, T nie są zliczane -
+    # tak samo w ścieżce zapasowej bez numpy, aby wynik nie zależał od zainstalowanych bibliotek.
+    if NUMPY_AVAILABLE:  # Szybka ścieżka wektorowa
+        return StatystykiKmerow(2).aktualizuj(sekwencja).do_slownika()  # Wynik w dotychczasowym formacie
+
     # Inicjalizacja słownika na statystyki mononukleotydów
     statystyki_mono_counts = {'A': 0, 'C': 0, 'G': 0, 'T': 0}  # Zmieniono nazwę dla jasności (surowe liczby)
     dlugosc_sek = len(sekwencja)  # Pobranie długości analizowanej sekwencji
@@ -98,43 +845,63 @@ def oblicz_statystyki(sekwencja: str) -> dict:  # Definicja funkcji obliczające
     if dlugosc_sek > 1:  # Obliczanie dinukleotydów ma sens tylko jeśli sekwencja ma co najmniej 2 nukleotydy
         for i in range(dlugosc_sek - 1):  # Pętla od pierwszego do przedostatniego nukleotydu
             dinukleotyd = sekwencja[i:i + 2]  # Pobranie pary nukleotydów (dinukleotydu)
-            statystyki_dinukleotydow[dinukleotyd] = statystyki_dinukleotydow.get(dinukleotyd,
-                                                                                 0) + 1  # Inkrementacja licznika dla danego dinukleotydu
+            if dinukleotyd[0] in statystyki_mono_counts and dinukleotyd[1] in statystyki_mono_counts:  # Tylko A, C, G, T
+                statystyki_dinukleotydow[dinukleotyd] = statystyki_dinukleotydow.get(dinukleotyd,
+                                                                                     0) + 1  # Inkrementacja licznika dla danego dinukleotydu
     statystyki_proc['dinukleotydy'] = statystyki_dinukleotydow  # Dodanie statystyk dinukleotydów do wynikowego słownika
 
     return statystyki_proc  # Zwrócenie słownika ze wszystkimi obliczonymi statystykami
 
 
-def wstaw_imie(sekwencja: str, imie: str) -> str:  # Definicja funkcji wstawiającej imię do sekwencji
-    """Wstawia imię w losowe miejsce sekwencji."""  # Docstring funkcji
+def wstaw_imie(sekwencja, imie: str,
+               pozycja: int = None) -> str:  # Definicja funkcji wstawiającej imię do sekwencji
+    """Wstawia imię w losowe (lub podane) miejsce sekwencji (str lub SekwencjaDNA2bit)."""  # Docstring funkcji
     if not sekwencja:  # Jeśli sekwencja jest pusta
         return imie  # Zwróć samo imię (lub pusty string jeśli imię też puste)
     if not imie:  # Jeśli imię jest puste
         return sekwencja  # Zwróć oryginalną, nienaruszoną sekwencję
 
-    pozycja = random.randint(0,
-                             len(sekwencja))  # Wybór losowej pozycji do wstawienia imienia (może być na początku, w środku lub na końcu)
+    # ULEPSZENIE 8 (ciąg dalszy):
+    # ORIGINAL:
+    # pozycja = random.randint(0, len(sekwencja))
+    # MODIFIED (Możliwość podania pozycji wstawienia - tryb wsadowy losuje ją z generatora danego rekordu):
+    # Dzięki temu wynik nie zależy od globalnego stanu modułu random w procesach roboczych.
+    if pozycja is None:  # Brak podanej pozycji
+        pozycja = random.randint(0,
+                                 len(sekwencja))  # Wybór losowej pozycji do wstawienia imienia (może być na początku, w środku lub na końcu)
+    elif not 0 <= pozycja <= len(sekwencja):  # Pozycja musi leżeć w obrębie sekwencji (włącznie z jej końcem)
+        raise ValueError("Pozycja wstawienia imienia wykracza poza sekwencję.")
+    if isinstance(sekwencja, SekwencjaDNA2bit):  # ULEPSZENIE 9: nakładka O(1) zamiast kopiowania całej sekwencji
+        return sekwencja.wstaw_imie(imie, pozycja)
     return sekwencja[:pozycja] + imie + sekwencja[
                                         pozycja:]  # Zwrócenie nowej sekwencji: część przed pozycją + imię + część po pozycji
 
 
 # ULEPSZENIE 2: Modyfikacja funkcji zapisującej do FASTA w celu zawijania długich linii sekwencji
-def zapisz_do_fasta(nazwa_pliku: str, id_sekwencji: str, opis: str, sekwencja_z_imieniem: str,
-                    szerokosc_linii: int = 70):  # Definicja funkcji zapisującej do pliku FASTA
-    """Zapisuje sekwencję do pliku w formacie FASTA, z opcjonalnym zawijaniem linii."""  # Docstring funkcji
-    with open(nazwa_pliku, 'w') as plik:  # Otwarcie pliku w trybie zapisu (tryb 'w' nadpisuje plik, jeśli istnieje)
-        plik.write(f">{id_sekwencji} {opis}\n")  # Zapis nagłówka FASTA (linia zaczynająca się od '>')
-        # ORIGINAL:
-        # plik.write(f"{sekwencja_z_imieniem}\n")
-        # MODIFIED (Dodanie zawijania linii sekwencji dla lepszej czytelności plików FASTA zgodnie ze standardem):
-        # Standard FASTA często zakłada zawijanie linii sekwencji (np. co 60-80 znaków), co ułatwia przeglądanie.
-        if szerokosc_linii <= 0:  # Jeśli podano niepoprawną szerokość linii (lub 0 dla braku zawijania)
-            plik.write(f"{sekwencja_z_imieniem}\n")  # Zapisz całą sekwencję w jednej linii
-        else:
-            for i in range(0, len(sekwencja_z_imieniem),
-                           szerokosc_linii):  # Pętla przez sekwencję z krokiem równym szerokości linii
-                plik.write(sekwencja_z_imieniem[
-                           i:i + szerokosc_linii] + "\n")  # Zapis fragmentu sekwencji i przejście do nowej linii
+def zapisz_do_fasta(nazwa_pliku: str, id_sekwencji: str, opis: str, sekwencja_z_imieniem,
+                    szerokosc_linii: int = 70, kompresja: str = None,
+                    indeks: bool = False, poziom_kompresji: int = POZIOM_KOMPRESJI):  # Definicja funkcji zapisującej do pliku FASTA
+    """Zapisuje sekwencję (str lub iterator fragmentów) do pliku FASTA, z opcjonalnym zawijaniem linii,
+    kompresją ('gzip' lub 'bgzf', poziom 1-9) i indeksem .fai."""  # Docstring funkcji
+    # ULEPSZENIE 2 - zawijanie linii:
+    # ORIGINAL:
+    # plik.write(f"{sekwencja_z_imieniem}\n")
+    # MODIFIED (Dodanie zawijania linii sekwencji dla lepszej czytelności plików FASTA zgodnie ze standardem):
+    # Standard FASTA często zakłada zawijanie linii sekwencji (np. co 60-80 znaków), co ułatwia przeglądanie.
+    # Szerokość <= 0 oznacza brak zawijania (cała sekwencja w jednej linii).
+    # ULEPSZENIE 7 (ciąg dalszy):
+    # ORIGINAL:
+    # with open(nazwa_pliku, 'w') as plik:
+    #     plik.write(f">{id_sekwencji} {opis}\n")
+    #     ...
+    #         for i in range(0, len(sekwencja_z_imieniem), szerokosc_linii):
+    #             plik.write(sekwencja_z_imieniem[i:i + szerokosc_linii] + "\n")
+    # MODIFIED (Zapis strumieniowy przez ZapisywaczFasta - duże, buforowane porcje zamiast milionów małych zapisów):
+    # Nagłówek i zasady zawijania pozostają bez zmian.
+    with ZapisywaczFasta(nazwa_pliku, szerokosc_linii, kompresja,
+                         indeks, poziom_kompresji) as zapisywacz:  # Otwarcie pliku (nadpisuje plik, jeśli istnieje)
+        zapisywacz.zapisz_rekord(id_sekwencji, opis, sekwencja_z_imieniem)  # Zapis nagłówka i zawiniętej sekwencji
+    return zapisywacz.pozycja  # Liczba zapisanych (nieskompresowanych) bajtów - potrzebna przy łączeniu plików
 
 
 # ULEPSZENIE 1: Funkcja do oczyszczania ID sekwencji na potrzeby nazwy pliku
@@ -153,10 +920,113 @@ def oczysc_id_dla_nazwy_pliku(id_sekwencji: str) -> str:  # Definicja funkcji oc
     return id_oczyszczone  # Zwróć oczyszczone ID
 
 
+# ULEPSZENIE 10: Profile składu w oknach przesuwnych (GC%, skos GC, CpG o/e) liczone w czasie O(n)
+# ORIGINAL:
+# (oblicz_statystyki daje tylko sumy dla całej sekwencji, a wykres pokazuje cztery słupki)
+# MODIFIED (Dodanie profilu w oknach o zadanej szerokości i kroku, liczonego z sum prefiksowych):
+# Liczba zasad w każdym oknie to różnica dwóch sum prefiksowych, więc koszt nie zależy od szerokości okna.
+# Profil działa na sekwencji podanej fragmentami i może być zapisany jako obraz bez wywołania plt.show().
+KLUCZE_PROFILU = ['start', 'GC_proc', 'GC_skos', 'CpG_oe', 'A_frac', 'C_frac', 'G_frac', 'T_frac']  # Kolumny profilu
+
+
+def _bloki_kodow_wejscia(sekwencja):
+    """Zamienia sekwencję (str, SekwencjaDNA2bit lub iterator fragmentów) na strumień bloków kodów numpy."""
+    if isinstance(sekwencja, SekwencjaDNA2bit):
+        return sekwencja.fragmenty_kodow(ROZMIAR_BLOKU_STATYSTYK)
+    if isinstance(sekwencja, (str, bytes)):
+        return (_koduj_fragment(sekwencja[start:start + ROZMIAR_BLOKU_STATYSTYK])
+                for start in range(0, len(sekwencja), ROZMIAR_BLOKU_STATYSTYK))
+    return (_koduj_fragment(fragment) for fragment in sekwencja)
+
+
+def _profil_bufora(kody, starty, okno: int) -> dict:
+    """Liczy wartości profilu dla okien [start, start + okno) leżących w całości w buforze kodów."""
+    konce = starty + okno
+    liczby = []
+    for kod in range(4):  # Sumy prefiksowe liczby A, C, G, T - liczba w oknie to różnica dwóch wartości
+        prefiks = np.concatenate(([0], np.cumsum(kody == kod, dtype=np.int32)))
+        liczby.append((prefiks[konce] - prefiks[starty]).astype(np.float64))
+    liczba_a, liczba_c, liczba_g, liczba_t = liczby
+    cpg = (kody[:-1] == 1) & (kody[1:] == 2)  # Dinukleotyd CG zaczynający się w danej pozycji
+    prefiks_cpg = np.concatenate(([0], np.cumsum(cpg, dtype=np.int32)))
+    liczba_cpg = (prefiks_cpg[konce - 1] - prefiks_cpg[starty]).astype(np.float64)  # Oba nukleotydy w oknie
+    suma_gc = liczba_g + liczba_c
+    iloczyn_cg = liczba_c * liczba_g
+    return {
+        'GC_proc': suma_gc / okno * 100,
+        'GC_skos': np.divide(liczba_g - liczba_c, suma_gc, out=np.zeros_like(suma_gc), where=suma_gc > 0),
+        'CpG_oe': np.divide(liczba_cpg * okno, iloczyn_cg, out=np.zeros_like(iloczyn_cg), where=iloczyn_cg > 0),
+        'A_frac': liczba_a / okno, 'C_frac': liczba_c / okno, 'G_frac': liczba_g / okno, 'T_frac': liczba_t / okno,
+    }
+
+
+def oblicz_profil_okien(sekwencja, okno: int = 1000, krok: int = None) -> dict:
+    """Oblicza profil składu w oknach przesuwnych o szerokości okno i kroku krok (domyślnie krok = okno).
+
+    Sekwencja może być str, SekwencjaDNA2bit lub iteratorem fragmentów. Zwraca słownik tablic numpy:
+    start (pozycja okna), GC_proc, GC_skos ((G-C)/(G+C)), CpG_oe (CpG obserwowane/oczekiwane) oraz
+    udziały A_frac, C_frac, G_frac, T_frac. Uwzględniane są tylko pełne okna.
+    """
+    _wymagaj_numpy()
+    krok = okno if krok is None else krok
+    if okno <= 0 or krok <= 0:  # Okno i krok muszą być dodatnie
+        raise ValueError("Szerokość okna i krok muszą być dodatnie.")
+    czesci = {klucz: [] for klucz in KLUCZE_PROFILU}
+    bufor = np.zeros(0, dtype=np.uint8)  # Kody okien, które nie zmieściły się jeszcze w całości
+    poczatek_bufora = 0  # Pozycja pierwszego kodu bufora w całej sekwencji
+    nastepny_start = 0  # Pozycja początku następnego okna
+    for kody in _bloki_kodow_wejscia(sekwencja):
+        bufor = np.concatenate((bufor, kody)) if len(bufor) else kody
+        koniec_bufora = poczatek_bufora + len(bufor)
+        if nastepny_start + okno <= koniec_bufora:  # Co najmniej jedno pełne okno w buforze
+            starty = np.arange(nastepny_start, koniec_bufora - okno + 1, krok, dtype=np.int64)
+            for klucz, wartosci in _profil_bufora(bufor, starty - poczatek_bufora, okno).items():
+                czesci[klucz].append(wartosci)
+            czesci['start'].append(starty)
+            nastepny_start = int(starty[-1]) + krok
+        odciecie = min(nastepny_start - poczatek_bufora, len(bufor))  # Kody przed następnym oknem nie są potrzebne
+        bufor = bufor[odciecie:]
+        poczatek_bufora += odciecie
+    return {klucz: np.concatenate(wartosci) if wartosci else np.zeros(0, dtype=np.int64 if klucz == 'start'
+                                                                       else np.float64)
+            for klucz, wartosci in czesci.items()}
+
+
+def rysuj_profil_okien(profil: dict, nazwa_pliku: str, id_sekwencji: str = "", okno: int = None):
+    """Rysuje profil okien (udziały zasad, GC%, skos GC, CpG o/e) i zapisuje go do pliku obrazu.
+
+    Rysunek powstaje bez pyplot (matplotlib.figure.Figure), więc nie otwiera okna i działa bez ekranu.
+    """
+    if not MATPLOTLIB_AVAILABLE:  # Sprawdzenie, czy biblioteka matplotlib jest dostępna
+        print("Wykres nie może być wygenerowany, ponieważ biblioteka matplotlib nie jest dostępna.")
+        return
+    from matplotlib.figure import Figure  # Figura niezależna od interaktywnego backendu
+
+    srodki = profil['start'] + (okno / 2 if okno else 0)  # Pozycja okna na osi X (środek, jeśli znana szerokość)
+    fig = Figure(figsize=(12, 9))
+    osie = fig.subplots(4, 1, sharex=True)
+    for nukleotyd in NUKLEOTYDY:  # Udziały poszczególnych zasad
+        osie[0].plot(srodki, profil[f'{nukleotyd}_frac'], label=nukleotyd, linewidth=0.8)
+    osie[0].set_ylabel('Udział zasady')
+    osie[0].legend(loc='upper right', ncol=4)
+    osie[1].plot(srodki, profil['GC_proc'], color='tab:green', linewidth=0.8)
+    osie[1].set_ylabel('%GC')
+    osie[2].plot(srodki, profil['GC_skos'], color='tab:purple', linewidth=0.8)
+    osie[2].axhline(0, color='grey', linewidth=0.5)
+    osie[2].set_ylabel('Skos GC')
+    osie[3].plot(srodki, profil['CpG_oe'], color='tab:red', linewidth=0.8)
+    osie[3].set_ylabel('CpG o/e')
+    osie[3].set_xlabel('Pozycja w sekwencji (bp)')
+    opis_okna = f", okno: {okno} bp" if okno else ""
+    fig.suptitle(f'Profil składu sekwencji: {id_sekwencji}{opis_okna}')
+    fig.tight_layout()
+    fig.savefig(nazwa_pliku, dpi=120)  # Zapis do pliku zamiast plt.show()
+
+
 # ULEPSZENIE 4 (ciąg dalszy): Funkcja rysująca wykres statystyk
-def rysuj_statystyki_wykres(statystyki: dict, id_sekwencji: str,
-                            dlugosc_oryginalna: int):  # Definicja funkcji rysującej wykres
-    """Rysuje wykres słupkowy procentowej zawartości nukleotydów."""  # Docstring funkcji
+def rysuj_statystyki_wykres(statystyki: dict, id_sekwencji: str, dlugosc_oryginalna: int,
+                            nazwa_pliku: str = None):  # Definicja funkcji rysującej wykres
+    """Rysuje wykres słupkowy procentowej zawartości nukleotydów (wyświetla go albo zapisuje do pliku)."""  # Docstring funkcji
     if not MATPLOTLIB_AVAILABLE:  # Sprawdzenie, czy biblioteka matplotlib jest dostępna
         print(
             "Wykres nie może być wygenerowany, ponieważ biblioteka matplotlib nie jest dostępna.")  # Informacja dla użytkownika
@@ -168,7 +1038,16 @@ def rysuj_statystyki_wykres(statystyki: dict, id_sekwencji: str,
 
     x = range(len(labels))  # Pozycje dla słupków na osi X
 
-    fig, ax = plt.subplots()  # Utworzenie figury i osi wykresu
+    # ULEPSZENIE 11 (ciąg dalszy):
+    # ORIGINAL:
+    # fig, ax = plt.subplots()
+    # MODIFIED (Tryb bez okna: przy podanej nazwie pliku figura powstaje bez pyplot i backendu interaktywnego):
+    if nazwa_pliku:  # Tryb bez okna - nie wymaga ekranu ani importu pyplot
+        from matplotlib.figure import Figure  # Figura niezależna od interaktywnego backendu
+        fig = Figure()  # Utworzenie figury
+        ax = fig.subplots()  # Utworzenie osi wykresu
+    else:
+        fig, ax = _pyplot().subplots()  # Utworzenie figury i osi wykresu
     rects = ax.bar(x, procenty, label='Procenty')  # Narysowanie słupków
 
     # Dodanie etykiet, tytułu i legendy
@@ -190,13 +1069,48 @@ def rysuj_statystyki_wykres(statystyki: dict, id_sekwencji: str,
                     ha='center', va='bottom')  # Wyrównanie tekstu
 
     fig.tight_layout()  # Dopasowanie układu, aby elementy się nie nakładały
-    plt.show()  # Wyświetlenie wykresu
+    if nazwa_pliku:  # Zapis do pliku zamiast wyświetlania
+        fig.savefig(nazwa_pliku)
+        return
+    _pyplot().show()  # Wyświetlenie wykresu
+
+
+def zapisz_wykresy_statystyk(wiersze: list, katalog: str, rozszerzenie: str = "png") -> list:
+    """Zapisuje do katalogu wykresy statystyk wielu sekwencji naraz (bez okien, bez plt.show()).
+
+    Każdy wiersz to słownik statystyk (jak z oblicz_statystyki) z dodatkowymi kluczami 'id' i 'dlugosc'.
+    Zwraca listę ścieżek zapisanych plików.
+    """
+    if not MATPLOTLIB_AVAILABLE:  # Sprawdzenie, czy biblioteka matplotlib jest dostępna
+        print("Wykresy nie mogą być wygenerowane, ponieważ biblioteka matplotlib nie jest dostępna.")
+        return []
+    os.makedirs(katalog, exist_ok=True)
+    sciezki = []
+    uzyte_nazwy = set()  # Unikalne nazwy plików także dla powtarzających się ID
+    for wiersz in wiersze:
+        nazwa = oczysc_id_dla_nazwy_pliku(str(wiersz['id']))
+        kandydat, numer = nazwa, 1
+        while kandydat in uzyte_nazwy:
+            numer += 1
+            kandydat = f"{nazwa}_{numer}"
+        uzyte_nazwy.add(kandydat)
+        sciezka = os.path.join(katalog, f"{kandydat}.{rozszerzenie}")
+        rysuj_statystyki_wykres(wiersz, str(wiersz['id']), int(wiersz['dlugosc']), sciezka)
+        sciezki.append(sciezka)
+    return sciezki
+
+
+def _wypisz_czas_importu():
+    """Wypisuje czas importu modułu i czas od początku importu do chwili wywołania (ULEPSZENIE 11)."""
+    print(f"Czas importu modułu: {CZAS_IMPORTU_S * 1000:.1f} ms")
+    print(f"Czas startu (od początku importu): {time.perf_counter() - _POCZATEK_IMPORTU:.3f} s")
 
 
 def main():  # Główna funkcja programu, sterująca jego wykonaniem
     """Główna funkcja programu."""  # Docstring funkcji
     print("Generator sekwencji DNA w formacie FASTA")  # Wyświetlenie tytułu programu
     print("-----------------------------------------")  # Wyświetlenie separatora
+    _wypisz_czas_importu()  # ULEPSZENIE 11: czas importu i startu, mierzony przed pierwszym pytaniem
 
     while True:  # Pętla nieskończona do pobierania długości sekwencji (przerywana przez break)
         try:  # Blok try-except do obsługi błędów przy konwersji inputu na liczbę
@@ -272,5 +1186,243 @@ def main():  # Główna funkcja programu, sterująca jego wykonaniem
         print("\nNie można wygenerować wykresu dla sekwencji o długości 0.")
 
 
+# ULEPSZENIE 8: Nieinteraktywny tryb wsadowy generujący wiele rekordów FASTA równolegle
+# ORIGINAL:
+# (main() generuje jedną sekwencję na uruchomienie i pobiera dane przez input())
+# MODIFIED (Dodanie trybu wsadowego sterowanego argumentami linii poleceń):
+# Rekordy opisuje manifest (plik TSV/CSV) lub liczba rekordów z szablonem. Każdy rekord dostaje ziarno wyprowadzone
+# z ziarna bazowego i swojego numeru, więc wynik jest identyczny bajt w bajt niezależnie od liczby procesów.
+KOLUMNY_STATYSTYK = ['nr', 'id', 'opis', 'dlugosc', 'ziarno', 'pozycja_imienia',
+                     'A_count', 'C_count', 'G_count', 'T_count',
+                     'A_proc', 'C_proc', 'G_proc', 'T_proc', 'CG_stosunek', 'plik']  # Kolumny łącznej tabeli statystyk
+
+
+def _parsuj_sklad(tekst: str) -> dict:
+    """Zamienia opis składu w postaci 'A:1,C:2,G:2,T:1' na słownik wag (pusty tekst -> None)."""
+    if not tekst or not tekst.strip():
+        return None
+    sklad = {}
+    for element in tekst.split(','):
+        nukleotyd, _, waga = element.partition(':')
+        if not waga:  # Każdy element musi mieć postać NUKLEOTYD:WAGA
+            raise ValueError(f"Niepoprawny opis składu: {tekst!r} (oczekiwano np. 'A:1,C:2,G:2,T:1').")
+        sklad[nukleotyd.strip().upper()] = float(waga)
+    return sklad
+
+
+def ziarno_rekordu(ziarno_bazowe: int, nr: int) -> int:
+    """Wyprowadza powtarzalne ziarno rekordu o numerze nr z ziarna bazowego (niezależne od procesu i kolejności)."""
+    return random.Random(f"{ziarno_bazowe}:{nr}").getrandbits(64)  # Ziarno tekstowe - stabilne między procesami
+
+
+def wczytaj_manifest(nazwa_pliku: str) -> list:
+    """Wczytuje manifest rekordów (TSV, lub CSV dla rozszerzenia .csv) z kolumnami:
+    id, opis, dlugosc, imie oraz opcjonalnie zawartosc_gc albo sklad."""
+    separator = ',' if nazwa_pliku.lower().endswith('.csv') else '\t'
+    rekordy = []
+    with open(nazwa_pliku, newline='', encoding='utf-8') as plik:
+        for numer_linii, wiersz in enumerate(csv.DictReader(plik, delimiter=separator), start=2):
+            if not (wiersz.get('id') or '').strip():  # ID jest wymagane, tak jak w trybie interaktywnym
+                raise ValueError(f"Manifest {nazwa_pliku}, linia {numer_linii}: brak ID sekwencji.")
+            zawartosc_gc = (wiersz.get('zawartosc_gc') or '').strip()
+            rekordy.append({
+                'id': wiersz['id'],
+                'opis': wiersz.get('opis') or '',
+                'dlugosc': int(wiersz['dlugosc']),
+                'imie': wiersz.get('imie') or '',
+                'zawartosc_gc': float(zawartosc_gc) if zawartosc_gc else None,
+                'sklad': _parsuj_sklad(wiersz.get('sklad')),
+            })
+    return rekordy
+
+
+def rekordy_z_szablonu(liczba: int, dlugosc: int, szablon_id: str = "seq_{nr}", szablon_opisu: str = "",
+                       imie: str = "", zawartosc_gc: float = None, sklad: dict = None) -> list:
+    """Tworzy listę rekordów według szablonu; w szablonach ID i opisu {nr} zastępowany jest numerem rekordu (od 1)."""
+    return [{'id': szablon_id.format(nr=nr), 'opis': szablon_opisu.format(nr=nr), 'dlugosc': dlugosc,
+             'imie': imie, 'zawartosc_gc': zawartosc_gc, 'sklad': sklad} for nr in range(1, liczba + 1)]
+
+
+def _przetworz_rekord_wsadowy(zadanie: dict) -> dict:
+    """Generuje, analizuje i zapisuje jeden rekord (funkcja wykonywana w procesie roboczym)."""
+    rekord = zadanie['rekord']
+    ziarno = ziarno_rekordu(zadanie['ziarno_bazowe'], zadanie['nr'])
+    if NUMPY_AVAILABLE:  # ULEPSZENIE 9: sekwencja spakowana - około 4 razy mniej pamięci na proces roboczy
+        czysta_sekwencja_dna = SekwencjaDNA2bit.generuj(rekord['dlugosc'], ziarno, rekord['sklad'],
+                                                        rekord['zawartosc_gc'])
+    else:
+        czysta_sekwencja_dna = generuj_sekwencje_dna(rekord['dlugosc'], ziarno, rekord['sklad'],
+                                                     rekord['zawartosc_gc'])
+    staty = oblicz_statystyki(czysta_sekwencja_dna)  # Statystyki liczone na czystej sekwencji, jak w main()
+    pozycja = random.Random(ziarno).randint(0, len(czysta_sekwencja_dna))  # Powtarzalna pozycja wstawienia imienia
+    sekwencja_do_zapisu = wstaw_imie(czysta_sekwencja_dna, rekord['imie'], pozycja)
+    del czysta_sekwencja_dna  # Zwolnienie pamięci przed zapisem
+    rozmiar = zapisz_do_fasta(zadanie['plik'], rekord['id'], rekord['opis'], sekwencja_do_zapisu,
+                              zadanie['szerokosc_linii'], zadanie['kompresja'], zadanie['indeks'])
+    wiersz = {kolumna: staty[kolumna] for kolumna in KOLUMNY_STATYSTYK if kolumna in staty}
+    wiersz.update({'nr': zadanie['nr'], 'id': rekord['id'], 'opis': rekord['opis'], 'dlugosc': rekord['dlugosc'],
+                   'ziarno': ziarno, 'pozycja_imienia': pozycja if rekord['imie'] else '',
+                   'plik': zadanie['plik'], 'rozmiar': rozmiar})
+    return wiersz
+
+
+def _kopiuj_bajty(zrodlo, cel, liczba_bajtow: int):
+    """Kopiuje podaną liczbę bajtów z pliku źródłowego do docelowego dużymi porcjami."""
+    while liczba_bajtow > 0:
+        dane = zrodlo.read(min(ROZMIAR_BUFORA_ZAPISU, liczba_bajtow))
+        if not dane:
+            break
+        cel.write(dane)
+        liczba_bajtow -= len(dane)
+
+
+def _scal_czesci(wyniki: list, nazwa_pliku: str, kompresja: str = None, indeks: bool = False):
+    """Łączy pliki częściowe (po jednym rekordzie) w jeden wielorekordowy plik FASTA wraz z indeksami."""
+    wpisy_fai = []  # Wpisy .fai z przesunięciami przeliczonymi względem połączonego pliku
+    granice_blokow = []  # Granice bloków BGZF połączonego pliku (dla .gzi)
+    przesuniecie = 0  # Pozycja początku bieżącej części w danych nieskompresowanych
+    przesuniecie_skompresowane = 0  # Pozycja początku bieżącej części w pliku wynikowym
+    with open(nazwa_pliku, 'wb') as plik_wynikowy:
+        for wynik in wyniki:
+            rozmiar_czesci = os.path.getsize(wynik['plik'])
+            if kompresja == "bgzf":  # Znacznik końca pliku BGZF zostaje tylko na końcu całości
+                rozmiar_czesci -= len(BGZF_EOF)
+                if przesuniecie:  # Pierwszy blok części jest granicą bloku w połączonym pliku
+                    granice_blokow.append((przesuniecie_skompresowane, przesuniecie))
+                if indeks:
+                    with open(f"{wynik['plik']}.gzi", 'rb') as plik_gzi:
+                        liczba_granic = struct.unpack("<Q", plik_gzi.read(8))[0]
+                        for _ in range(liczba_granic):
+                            skompresowane, nieskompresowane = struct.unpack("<QQ", plik_gzi.read(16))
+                            granice_blokow.append((skompresowane + przesuniecie_skompresowane,
+                                                   nieskompresowane + przesuniecie))
+            if indeks:
+                with open(f"{wynik['plik']}.fai") as plik_fai:
+                    for linia in plik_fai:
+                        pola = linia.rstrip('\n').split('\t')
+                        pola[2] = str(int(pola[2]) + przesuniecie)
+                        wpisy_fai.append('\t'.join(pola) + '\n')
+            with open(wynik['plik'], 'rb') as czesc:
+                _kopiuj_bajty(czesc, plik_wynikowy, rozmiar_czesci)
+            przesuniecie += wynik['rozmiar']
+            przesuniecie_skompresowane += rozmiar_czesci
+        if kompresja == "bgzf":
+            plik_wynikowy.write(BGZF_EOF)
+    if indeks:
+        with open(f"{nazwa_pliku}.fai", 'w') as plik_fai:
+            plik_fai.writelines(wpisy_fai)
+        if kompresja == "bgzf":
+            with open(f"{nazwa_pliku}.gzi", 'wb') as plik_gzi:
+                plik_gzi.write(struct.pack("<Q", len(granice_blokow)))
+                plik_gzi.write(b"".join(struct.pack("<QQ", *granica) for granica in granice_blokow))
+
+
+def zapisz_tabele_statystyk(nazwa_pliku: str, wiersze: list):
+    """Zapisuje łączną tabelę statystyk wszystkich rekordów (TSV) w kolejności rekordów."""
+    with open(nazwa_pliku, 'w', newline='', encoding='utf-8') as plik:
+        zapis = csv.DictWriter(plik, fieldnames=KOLUMNY_STATYSTYK, delimiter='\t', extrasaction='ignore')
+        zapis.writeheader()
+        for wiersz in wiersze:
+            zapis.writerow({kolumna: f"{wartosc:.4f}" if isinstance(wartosc, float) else wartosc
+                            for kolumna, wartosc in wiersz.items()})  # Stały format liczb - powtarzalny plik
+
+
+def generuj_wsadowo(rekordy: list, plik_wyjsciowy: str = None, katalog_shardow: str = None,
+                    plik_statystyk: str = "statystyki.tsv", ziarno_bazowe: int = 0, procesy: int = None,
+                    szerokosc_linii: int = 70, kompresja: str = None, indeks: bool = False) -> list:
+    """Generuje i analizuje wiele rekordów w puli procesów; zapisuje jeden plik wielorekordowy
+    (plik_wyjsciowy) albo osobny plik na rekord (katalog_shardow) oraz łączną tabelę statystyk."""
+    if (plik_wyjsciowy is None) == (katalog_shardow is None):  # Dokładnie jeden sposób zapisu
+        raise ValueError("Podaj albo plik wyjściowy, albo katalog shardów.")
+    if indeks and kompresja == "gzip":  # Sprawdzenie przed uruchomieniem procesów roboczych
+        raise ValueError("Indeks .fai wymaga pliku nieskompresowanego lub skompresowanego w formacie BGZF.")
+    rozszerzenie = ".fasta" + (".gz" if kompresja else "")
+    if katalog_shardow is not None:  # Osobny plik na rekord, nazwany jak w trybie interaktywnym
+        os.makedirs(katalog_shardow, exist_ok=True)
+        nazwy = [oczysc_id_dla_nazwy_pliku(rekord['id']) for rekord in rekordy]
+        if len(set(nazwy)) != len(nazwy):  # Dwa rekordy nie mogą nadpisać tego samego pliku
+            raise ValueError("ID rekordów po oczyszczeniu muszą być unikalne w trybie shardów.")
+        pliki = [os.path.join(katalog_shardow, nazwa + rozszerzenie) for nazwa in nazwy]
+        katalog_czesci = None
+    else:  # Pliki częściowe w katalogu tymczasowym obok pliku wynikowego (ten sam system plików)
+        katalog_czesci = tempfile.mkdtemp(prefix=".czesci_", dir=os.path.dirname(os.path.abspath(plik_wyjsciowy)))
+        pliki = [os.path.join(katalog_czesci, f"czesc_{nr:08d}{rozszerzenie}") for nr in range(1, len(rekordy) + 1)]
+    zadania = [{'nr': nr, 'rekord': rekord, 'plik': plik, 'ziarno_bazowe': ziarno_bazowe,
+                'szerokosc_linii': szerokosc_linii, 'kompresja': kompresja, 'indeks': indeks}
+               for nr, (rekord, plik) in enumerate(zip(rekordy, pliki), start=1)]
+    try:
+        if procesy == 1:  # Bez puli procesów - ten sam wynik, mniejszy narzut
+            wyniki = [_przetworz_rekord_wsadowy(zadanie) for zadanie in zadania]
+        else:
+            with ProcessPoolExecutor(max_workers=procesy) as pula:  # map zachowuje kolejność rekordów
+                wyniki = list(pula.map(_przetworz_rekord_wsadowy, zadania))
+        if katalog_czesci is not None:
+            _scal_czesci(wyniki, plik_wyjsciowy, kompresja, indeks)
+            for wynik in wyniki:
+                wynik['plik'] = plik_wyjsciowy
+    finally:
+        if katalog_czesci is not None:
+            shutil.rmtree(katalog_czesci, ignore_errors=True)  # Usunięcie plików częściowych
+    if plik_statystyk:
+        zapisz_tabele_statystyk(plik_statystyk, wyniki)
+    return wyniki
+
+
+def main_wsadowy(argumenty: list = None):
+    """Punkt wejścia trybu wsadowego (bez input())."""
+    parser = argparse.ArgumentParser(description="Wsadowy generator sekwencji DNA w formacie FASTA.")
+    zrodlo = parser.add_mutually_exclusive_group(required=True)
+    zrodlo.add_argument('--manifest', help="Plik TSV/CSV z kolumnami: id, opis, dlugosc, imie, [zawartosc_gc | sklad].")
+    zrodlo.add_argument('--liczba', type=int, help="Liczba rekordów tworzonych według szablonu.")
+    parser.add_argument('--dlugosc', type=int, help="Długość sekwencji w trybie szablonu.")
+    parser.add_argument('--szablon-id', default="seq_{nr}", help="Szablon ID rekordu ({nr} = numer rekordu).")
+    parser.add_argument('--szablon-opisu', default="", help="Szablon opisu rekordu ({nr} = numer rekordu).")
+    parser.add_argument('--imie', default="", help="Imię wstawiane do każdej sekwencji w trybie szablonu.")
+    sklad_grupa = parser.add_mutually_exclusive_group()
+    sklad_grupa.add_argument('--zawartosc-gc', type=float, help="Docelowa zawartość GC w procentach.")
+    sklad_grupa.add_argument('--sklad', help="Docelowy skład, np. 'A:1,C:2,G:2,T:1'.")
+    wyjscie = parser.add_mutually_exclusive_group()
+    wyjscie.add_argument('--wyjscie', help="Wielorekordowy plik FASTA (domyślnie wsadowe.fasta).")
+    wyjscie.add_argument('--shardy', help="Katalog na osobne pliki FASTA dla każdego rekordu.")
+    parser.add_argument('--statystyki', default="statystyki.tsv", help="Plik łącznej tabeli statystyk (TSV).")
+    parser.add_argument('--ziarno', type=int, help="Ziarno bazowe (domyślnie losowe, wypisywane na ekran).")
+    parser.add_argument('--procesy', type=int, default=os.cpu_count(), help="Liczba procesów roboczych.")
+    parser.add_argument('--szerokosc-linii', type=int, default=70, help="Szerokość linii (<= 0: bez zawijania).")
+    parser.add_argument('--kompresja', choices=["gzip", "bgzf"], help="Kompresja plików wynikowych.")
+    parser.add_argument('--indeks', action='store_true', help="Zapisz indeks .fai (wymaga braku kompresji lub BGZF).")
+    parser.add_argument('--wykresy', help="Katalog na wykresy statystyk wszystkich rekordów (bez okien).")
+    parser.add_argument('--czas-startu', action='store_true', help="Wypisz czas importu modułu i czas działania.")
+    argumenty = parser.parse_args(argumenty)
+    if argumenty.indeks and argumenty.kompresja == "gzip":
+        parser.error("--indeks wymaga braku kompresji lub --kompresja bgzf (zwykły gzip nie ma swobodnego dostępu).")
+
+    if argumenty.manifest:
+        rekordy = wczytaj_manifest(argumenty.manifest)
+    else:
+        if argumenty.dlugosc is None:
+            parser.error("--liczba wymaga podania --dlugosc.")
+        rekordy = rekordy_z_szablonu(argumenty.liczba, argumenty.dlugosc, argumenty.szablon_id,
+                                     argumenty.szablon_opisu, argumenty.imie, argumenty.zawartosc_gc,
+                                     _parsuj_sklad(argumenty.sklad))
+    ziarno_bazowe = argumenty.ziarno if argumenty.ziarno is not None else random.getrandbits(32)
+    plik_wyjsciowy = None if argumenty.shardy else (argumenty.wyjscie or "wsadowe.fasta")
+    print(f"Generowanie {len(rekordy)} rekordów (ziarno bazowe: {ziarno_bazowe}, procesy: {argumenty.procesy})...")
+    wyniki = generuj_wsadowo(rekordy, plik_wyjsciowy, argumenty.shardy, argumenty.statystyki, ziarno_bazowe,
+                             argumenty.procesy, argumenty.szerokosc_linii, argumenty.kompresja, argumenty.indeks)
+    print(f"Sekwencje zapisano do: {plik_wyjsciowy or argumenty.shardy}")
+    print(f"Tabela statystyk: {argumenty.statystyki}")
+    if argumenty.wykresy:  # Wszystkie wykresy renderowane naraz do plików
+        zapisz_wykresy_statystyk(wyniki, argumenty.wykresy)
+        print(f"Wykresy zapisano do katalogu: {argumenty.wykresy}")
+    if argumenty.czas_startu:
+        print(f"Czas importu modułu: {CZAS_IMPORTU_S * 1000:.1f} ms")
+        print(f"Czas działania (od początku importu): {time.perf_counter() - _POCZATEK_IMPORTU:.3f} s")
+
+
+CZAS_IMPORTU_S = time.perf_counter() - _POCZATEK_IMPORTU  # Czas importu modułu (ULEPSZENIE 11)
+
 if __name__ == "__main__":  # Standardowy idiom w Pythonie: kod w tym bloku wykona się tylko, gdy plik jest uruchamiany bezpośrednio (nie importowany jako moduł)
-    main()  # Wywołanie głównej funkcji programu
\ No newline at end of file
+    if len(sys.argv) > 1:  # Argumenty w linii poleceń: tryb wsadowy (ULEPSZENIE 8)
+        main_wsadowy()
+    else:
+        main()  # Wywołanie głównej funkcji programu
\ No newline at end of file